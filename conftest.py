@@ -0,0 +1,66 @@
+"""
+Shared pytest fixtures for the SBEMS system tests.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sbems.core.building import Building, Zone, BuildingInfo
+from sbems.core.monitoring_system import MonitoringSystem, MonitoringConfig
+from sbems.sensors.hvac_sensor import HVACSensor
+from sbems.sensors.lighting_sensor import LightingSensor
+from sbems.sensors.occupancy_sensor import OccupancySensor
+from sbems.sensors.energy_meter import EnergyMeter
+
+
+@pytest.fixture(scope="session")
+def building_info():
+    """Information for the test building."""
+    return BuildingInfo(
+        name="Test Building",
+        address="123 Test St",
+        total_area=1000.0,
+        floors=2,
+        building_type="office",
+        year_built=2023,
+        energy_rating="A"
+    )
+
+
+@pytest.fixture(scope="session")
+def building(building_info):
+    """Test building with one office zone and one sensor of each kind, built once per session."""
+    building = Building(building_info)
+    building.add_zone(Zone("test_zone", "Test Office", 100.0, 1, "office", 10, (10.0, 10.0, 0.0)))
+
+    sensors = [
+        HVACSensor(hvac_type="temperature", sensor_id="hvac_001", position=(5.0, 5.0, 2.5)),
+        LightingSensor(lighting_type="illuminance", sensor_id="light_001", position=(5.0, 7.0, 2.8)),
+        OccupancySensor(occupancy_type="people_count", max_occupancy=10, sensor_id="occ_001", position=(7.0, 5.0, 2.2)),
+        EnergyMeter(meter_type="power", circuit_capacity=1000.0, sensor_id="energy_001", position=(3.0, 3.0, 0.0))
+    ]
+    for sensor in sensors:
+        building.add_sensor(sensor, "test_zone")
+
+    return building
+
+
+@pytest.fixture(scope="session")
+def monitoring(building):
+    """Manually stepped monitoring system (without anomaly detection to avoid sklearn dependency)."""
+    config = MonitoringConfig(
+        sampling_interval=1,
+        anomaly_check_interval=5,
+        auto_start=False,  # Manual control
+        save_history=True
+    )
+    monitoring = MonitoringSystem(building, config)
+    yield monitoring
+    if monitoring.is_running:
+        monitoring.stop_monitoring()
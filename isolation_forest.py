@@ -1,8 +1,45 @@
+import math
+import multiprocessing as mp
+from queue import Empty
+
 import numpy as np
 import matplotlib.pyplot as plt
 import networkx as nx
+from joblib import parallel_backend
+from scipy.sparse import csr_matrix
 from sklearn.ensemble import IsolationForest
 import matplotlib.animation as animation
+from matplotlib.colors import to_rgba
+
+# Angular frequency of the simulated daily cycle (one period per 1440 timesteps)
+_OMEGA = 2 * math.pi / 1440
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba not installed: fall back to the NumPy simulation path
+    njit = None
+
+# Sensor count above which the compiled simulation kernel is used
+_NUMBA_MIN_SENSORS = 1000
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _simulate_into_buffer(buf, idx, base, deviations):
+        """
+        Write one reading per sensor into column `idx` of the buffer.
+
+        The random deviations are drawn by the caller from the seeded generator,
+        so the kernel itself is deterministic.
+        """
+        n = buf.shape[0]
+        data = np.empty(n)
+        for k in prange(n):
+            reading = base + deviations[k]
+            buf[k, idx] = reading
+            data[k] = reading
+        return data
 
 
 class SensorNetworkMonitor:
@@ -22,28 +59,38 @@ class SensorNetworkMonitor:
         self.anomaly_ratio = anomaly_ratio
         self.seed = seed
         self.positions = {}
+        self._positions_arr = np.empty((num_sensors, 2), dtype=np.float64)
         self.graph = nx.Graph()
-        self.data_history = []
+        # Symmetric CSR adjacency mirroring self.graph for vectorized analytics
+        self.adjacency = None
+        # Circular (num_sensors, window_size) buffer of recent readings
+        self._buf = np.empty((num_sensors, window_size), dtype=np.float64)
+        self._idx = 0
+        self._filled = 0
+        # Isolation Forest is refit only every `_refit_every` detections
+        self._model = None
+        self._frames_since_fit = 0
+        self._refit_every = 10
+        # RGBA rows indexed by anomaly flag: 0 -> normal (green), 1 -> anomaly (red)
+        self._color_lut = np.array([to_rgba("green"), to_rgba("red")])
         self._init_rng()
         self._generate_network()
+        self._use_numba = njit is not None and num_sensors >= _NUMBA_MIN_SENSORS
 
     def _init_rng(self):
         """
         Set up the random number generator for reproducibility.
         """
-        np.random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed)
 
     def _generate_positions(self):
         """
         Generate random spatial coordinates for the sensors.
         """
-        return {
-            i: (
-                np.random.uniform(0, self.area_size),
-                np.random.uniform(0, self.area_size),
-            )
-            for i in range(self.num_sensors)
-        }
+        self._positions_arr = self.rng.uniform(
+            0, self.area_size, size=(self.num_sensors, 2)
+        )
+        return {i: tuple(xy) for i, xy in enumerate(self._positions_arr.tolist())}
 
     def _generate_network(self):
         """
@@ -53,48 +100,88 @@ class SensorNetworkMonitor:
         self.graph.clear()
         for i in range(self.num_sensors):
             self.graph.add_node(i, pos=self.positions[i])
-        for i in range(self.num_sensors):
-            for j in range(i + 1, self.num_sensors):
-                dist = np.linalg.norm(
-                    np.array(self.positions[i]) - np.array(self.positions[j])
-                )
-                if dist < self.area_size * 0.2:
-                    self.graph.add_edge(i, j)
+        P = self._positions_arr
+        # Pairwise squared distances via |a|² + |b|² - 2a·b, compared against
+        # the squared threshold so no sqrt is needed
+        thresh2 = (self.area_size * 0.2) ** 2
+        sq = np.sum(P * P, axis=1)
+        D2 = sq[:, None] + sq[None, :] - 2 * P @ P.T
+        i, j = np.where(np.triu(D2 < thresh2, k=1))
+        self.graph.add_edges_from(zip(i.tolist(), j.tolist()))
+        n = self.num_sensors
+        self.adjacency = csr_matrix(
+            (np.ones(2 * i.size, dtype=np.int8), (np.r_[i, j], np.r_[j, i])),
+            shape=(n, n),
+        )
 
     def generate_sensor_data(self, timestep):
         """
         Simulate sensor readings at a given time step.
         """
-        data = []
-        for _ in range(self.num_sensors):
-            base = 20 + 5 * np.sin(2 * np.pi * timestep / 1440)
-            noise = np.random.normal(0, 0.5)
-            if np.random.rand() < self.anomaly_ratio:
-                reading = base + noise + np.random.normal(15, 5)
-            else:
-                reading = base + noise
-            data.append(reading)
-        return np.array(data)
+        base = 20 + 5 * math.sin(_OMEGA * timestep)
+        return base + self._sample_deviations()
+
+    def _sample_deviations(self):
+        """
+        Draw each sensor's measurement noise plus any anomaly spike for one time step.
+        """
+        n = self.num_sensors
+        noise = self.rng.normal(0, 0.5, size=n)
+        mask = self.rng.random(n) < self.anomaly_ratio
+        spikes = self.rng.normal(15, 5, size=n) * mask
+        return noise + spikes
 
     def detect_anomalies(self):
         """
         Apply Isolation Forest to identify anomalous sensors.
         """
-        matrix = np.stack(self.data_history, axis=1)
-        features = np.mean(matrix, axis=1).reshape(-1, 1)
-        model = IsolationForest(
-            contamination=self.anomaly_ratio, random_state=self.seed
-        )
-        preds = model.fit_predict(features)
-        return ["red" if p == -1 else "green" for p in preds]
+        # The mean is order-invariant, so the circular layout needs no unrolling
+        features = self._buf[:, : self._filled].mean(axis=1, keepdims=True)
+        # No sensor stands out when all rolling means coincide; skip the model
+        if features.std() < 1e-3:
+            return self._color_lut[np.zeros(self.num_sensors, dtype=np.int8)]
+        # IsolationForest.predict ignores n_jobs unless run inside a joblib
+        # parallel_backend context (scikit-learn issue workaround)
+        with parallel_backend("threading", n_jobs=-1):
+            if self._model is None or self._frames_since_fit >= self._refit_every:
+                # Single-feature data has little path variance, so 50 trees suffice
+                self._model = IsolationForest(
+                    contamination=self.anomaly_ratio,
+                    random_state=self.seed,
+                    n_estimators=50,
+                    n_jobs=-1,
+                )
+                preds = self._model.fit_predict(features)
+                self._frames_since_fit = 0
+            else:
+                preds = self._model.predict(features)
+        self._frames_since_fit += 1
+        return self._color_lut[(preds == -1).astype(np.int8)]
 
     def update_history(self, data):
         """
         Update the temporal window of recent data.
         """
-        self.data_history.append(data)
-        if len(self.data_history) > self.window_size:
-            self.data_history.pop(0)
+        self._buf[:, self._idx] = data
+        self._idx = (self._idx + 1) % self.window_size
+        self._filled = min(self._filled + 1, self.window_size)
+
+    def step(self, timestep):
+        """
+        Generate readings for one time step and push them into the temporal window.
+
+        Large networks write the buffer with the compiled Numba kernel when available.
+        Both paths draw from the seeded generator, so a seed reproduces the same readings.
+        """
+        if not self._use_numba:
+            data = self.generate_sensor_data(timestep)
+            self.update_history(data)
+            return data
+        base = 20 + 5 * math.sin(_OMEGA * timestep)
+        data = _simulate_into_buffer(self._buf, self._idx, base, self._sample_deviations())
+        self._idx = (self._idx + 1) % self.window_size
+        self._filled = min(self._filled + 1, self.window_size)
+        return data
 
     def run_visualization(self, frames=200, interval=200):
         """
@@ -105,15 +192,16 @@ class SensorNetworkMonitor:
         ax.set_xlim(0, self.area_size)
         ax.set_ylim(0, self.area_size)
         ax.set_title("Sensor network monitoring - Anomaly detection")
+        # Sensor positions are static, so set them once rather than every frame
+        scatter.set_offsets(self._positions_arr)
+        # Exclude the scatter from the cached background so blitting only redraws it
+        scatter.set_animated(True)
 
         def update(frame):
-            data = self.generate_sensor_data(frame)
-            self.update_history(data)
-            if len(self.data_history) < self.window_size:
+            self.step(frame)
+            if self._filled < self.window_size:
                 return (scatter,)
             colors = self.detect_anomalies()
-            coords = np.array([self.positions[i] for i in range(self.num_sensors)])
-            scatter.set_offsets(coords)
             scatter.set_color(colors)
             return (scatter,)
 
@@ -123,6 +211,60 @@ class SensorNetworkMonitor:
         )
         plt.show()
 
+    def run_visualization_process(self, frames=200, interval=200):
+        """
+        Run simulation and detection in this process while a child process renders.
+
+        Anomaly colors are streamed to the plotting process through a queue, so the
+        compute loop is not paced by the animation interval or by rendering cost.
+        """
+        queue = mp.Queue()
+        plotter = mp.Process(
+            target=_live_plot_process,
+            args=(queue, self._positions_arr, self.area_size, interval),
+            daemon=True,
+        )
+        plotter.start()
+        for frame in range(frames):
+            self.step(frame)
+            if self._filled < self.window_size:
+                continue
+            queue.put(self.detect_anomalies())
+        plotter.join()
+        # Frames left unread once the window closes must not block interpreter exit
+        queue.cancel_join_thread()
+
+
+def _live_plot_process(queue, positions, area_size, interval):
+    """
+    Host the network animation in a separate process, drawing the latest colors received.
+    """
+    fig, ax = plt.subplots()
+    scatter = ax.scatter([], [], c=[], cmap="coolwarm", vmin=15, vmax=45, s=100)
+    ax.set_xlim(0, area_size)
+    ax.set_ylim(0, area_size)
+    ax.set_title("Sensor network monitoring - Anomaly detection")
+    scatter.set_offsets(positions)
+    scatter.set_animated(True)
+
+    def update(frame):
+        # Drain the queue and keep only the most recent frame
+        latest = None
+        try:
+            while True:
+                latest = queue.get_nowait()
+        except Empty:
+            pass
+        if latest is not None:
+            scatter.set_color(latest)
+        return (scatter,)
+
+    # Keep reference to animation to avoid garbage collection
+    ani = animation.FuncAnimation(
+        fig, update, interval=interval, blit=True, cache_frame_data=False
+    )
+    plt.show()
+
 
 # System execution with initial pre-loading
 if __name__ == "__main__":
@@ -130,7 +272,6 @@ if __name__ == "__main__":
 
     # Fill the window buffer before animation
     for t in range(monitor.window_size):
-        data = monitor.generate_sensor_data(t)
-        monitor.update_history(data)
+        monitor.step(t)
 
     monitor.run_visualization()
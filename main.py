@@ -5,19 +5,26 @@ Main entry point for the Smart Building Energy Management System.
 import argparse
 import sys
 import time
+from itertools import islice
 from pathlib import Path
 from typing import List, Tuple
-import random
 
+import numpy as np
 from loguru import logger
 
 from sbems.core.building import Building, Zone, BuildingInfo
-from sbems.core.monitoring_system import MonitoringSystem, MonitoringConfig
+from sbems.core.monitoring_system import MonitoringSystem, MonitoringConfig, epoch_us_to_iso
 from sbems.sensors.hvac_sensor import HVACSensor
 from sbems.sensors.lighting_sensor import LightingSensor
 from sbems.sensors.occupancy_sensor import OccupancySensor
 from sbems.sensors.energy_meter import EnergyMeter
 
+# Circuit capacity multipliers for zone types that draw more than the baseline
+_CAP_MULT = {
+    "server_room": 10.0,  # Server rooms use much more power
+    "kitchen": 3.0,  # Kitchens use more power
+}
+
 
 def create_demo_building() -> Building:
     """Create a comprehensive demo building with realistic sensors."""
@@ -65,7 +72,10 @@ def create_demo_building() -> Building:
     # Add sensors to zones
     sensor_counter = 1
     
-    for zone in zones:
+    # Position jitter (x, y) for the three HVAC sensors of every zone, drawn in one batch
+    hvac_jitter = np.random.uniform(-5, 5, size=(len(zones), 3, 2))
+    
+    for zone_idx, zone in enumerate(zones):
         logger.info(f"Adding sensors to zone: {zone.name}")
         
         # Add HVAC sensors (temperature, humidity, air quality)
@@ -73,24 +83,24 @@ def create_demo_building() -> Building:
             HVACSensor(
                 hvac_type="temperature",
                 sensor_id=f"hvac_temp_{sensor_counter:03d}",
-                position=(zone.position[0] + random.uniform(-5, 5), 
-                         zone.position[1] + random.uniform(-5, 5), 
+                position=(zone.position[0] + hvac_jitter[zone_idx, 0, 0], 
+                         zone.position[1] + hvac_jitter[zone_idx, 0, 1], 
                          zone.position[2] + 2.5),
                 name=f"Temperature - {zone.name}"
             ),
             HVACSensor(
                 hvac_type="humidity",
                 sensor_id=f"hvac_humid_{sensor_counter:03d}",
-                position=(zone.position[0] + random.uniform(-5, 5), 
-                         zone.position[1] + random.uniform(-5, 5), 
+                position=(zone.position[0] + hvac_jitter[zone_idx, 1, 0], 
+                         zone.position[1] + hvac_jitter[zone_idx, 1, 1], 
                          zone.position[2] + 2.5),
                 name=f"Humidity - {zone.name}"
             ),
             HVACSensor(
                 hvac_type="air_quality",
                 sensor_id=f"hvac_aqi_{sensor_counter:03d}",
-                position=(zone.position[0] + random.uniform(-5, 5), 
-                         zone.position[1] + random.uniform(-5, 5), 
+                position=(zone.position[0] + hvac_jitter[zone_idx, 2, 0], 
+                         zone.position[1] + hvac_jitter[zone_idx, 2, 1], 
                          zone.position[2] + 2.5),
                 name=f"Air Quality - {zone.name}"
             )
@@ -131,11 +141,8 @@ def create_demo_building() -> Building:
         ]
         
         # Add energy meters
-        circuit_capacity = zone.area * 20  # 20W per square meter baseline
-        if zone.zone_type == "server_room":
-            circuit_capacity *= 10  # Server rooms use much more power
-        elif zone.zone_type == "kitchen":
-            circuit_capacity *= 3  # Kitchens use more power
+        # 20W per square meter baseline, scaled for power-hungry zone types
+        circuit_capacity = zone.area * 20.0 * _CAP_MULT.get(zone.zone_type, 1.0)
         
         energy_sensors = [
             EnergyMeter(
@@ -206,19 +213,20 @@ def run_demo(duration_minutes: int = 10, sampling_interval: int = 30) -> None:
         logger.info("=" * 60)
         
         # Run for specified duration
-        start_time = time.time()
+        start_time = time.monotonic()
         end_time = start_time + (duration_minutes * 60)
         
         step_count = 0
-        while time.time() < end_time:
+        while time.monotonic() < end_time:
             time.sleep(10)  # Check every 10 seconds
             
             step_count += 1
             
             # Print status every minute
             if step_count % 6 == 0:  # Every 60 seconds (6 * 10s)
-                status = monitoring.get_current_status()
+                # The dashboard embeds the monitoring status, so both reflect one snapshot
                 dashboard_data = monitoring.get_dashboard_data()
+                status = dashboard_data["monitoring"]
                 
                 logger.info(f"⚡ Status Update (Runtime: {status['runtime_seconds']:.0f}s)")
                 logger.info(f"   📈 Readings: {status['total_readings']}")
@@ -311,7 +319,7 @@ def run_interactive_mode() -> None:
             
             elif command == "sensors":
                 logger.info(f"Total Sensors: {len(building.sensors)}")
-                for sensor_id, sensor in list(building.sensors.items())[:10]:  # Show first 10
+                for sensor_id, sensor in islice(building.sensors.items(), 10):  # Show first 10
                     logger.info(f"  {sensor_id}: {sensor.sensor_type} ({sensor.name})")
                 if len(building.sensors) > 10:
                     logger.info(f"  ... and {len(building.sensors) - 10} more")
@@ -321,7 +329,7 @@ def run_interactive_mode() -> None:
                 logger.info(f"Recent readings (last hour): {len(readings)}")
                 if readings:
                     latest = readings[-1]
-                    logger.info(f"Latest reading timestamp: {latest['timestamp']}")
+                    logger.info(f"Latest reading timestamp: {epoch_us_to_iso(latest['ts_us'])}")
                     logger.info(f"Active sensors in latest reading: {len(latest['readings'])}")
             
             elif command == "alerts":
@@ -31,20 +31,15 @@ def test_imports():
             "sbems/sensors",
             "sbems/analytics",
             "sbems/api",
-            "sbems/database",
             "config",
             "docs",
-            "tests",
-            "web"
+            "tests"
         ]
         
         for dir_path in required_dirs:
             full_path = project_root / dir_path
-            if full_path.exists():
-                print(f"   ✅ {dir_path} directory exists")
-            else:
-                print(f"   ❌ {dir_path} directory missing")
-                return False
+            assert full_path.exists(), f"{dir_path} directory missing"
+            print(f"   ✅ {dir_path} directory exists")
         
         # Test required files
         print("3. Testing required files...")
@@ -59,11 +54,8 @@ def test_imports():
         
         for file_path in required_files:
             full_path = project_root / file_path
-            if full_path.exists():
-                print(f"   ✅ {file_path} exists")
-            else:
-                print(f"   ❌ {file_path} missing")
-                return False
+            assert full_path.exists(), f"{file_path} missing"
+            print(f"   ✅ {file_path} exists")
         
         print("\n🎉 Project structure is correct!")
         print("\nNext steps to run the full system:")
@@ -74,14 +66,13 @@ def test_imports():
         print("\n3. Try interactive mode:")
         print("   python3 main.py --interactive")
         
-        return True
-        
     except Exception as e:
         print(f"❌ Import test failed: {e}")
-        return False
+        raise
 
 
 if __name__ == "__main__":
-    success = test_imports()
-    if not success:
+    try:
+        test_imports()
+    except Exception:
         sys.exit(1)
@@ -0,0 +1,22 @@
+"""
+Compatibility shims for optional dependencies and interpreter versions.
+"""
+
+import sys
+
+# dataclass(slots=True) needs Python 3.10; older interpreters keep per-instance dicts
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+try:
+    from numba import njit, prange, vectorize
+except ImportError:
+    # Numba not installed: run the numeric kernels as plain Python
+    import numpy as np
+    
+    def njit(*args, **kwargs):
+        return lambda func: func
+    
+    def vectorize(*args, **kwargs):
+        return np.vectorize
+    
+    prange = range
@@ -3,12 +3,12 @@ Advanced anomaly detection system based on Isolation Forest with energy-specific
 """
 
 import numpy as np
-import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 
 from sklearn.ensemble import IsolationForest
@@ -16,8 +16,117 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import DBSCAN
 import networkx as nx
 
+from .._compat import njit
+
 warnings.filterwarnings('ignore')
 
+NS_PER_SECOND = 1_000_000_000
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+# Storage dtype for windowed sensor values; statistics are accumulated in float64
+VALUE_DTYPE = np.float32
+
+# Size of the trailing window compared against history in energy spike detection
+RECENT_WINDOW = 10
+
+# Running (count, mean, M2) accumulator for Welford's online variance
+WelfordState = Tuple[int, float, float]
+
+
+def _to_ns(timestamp: datetime) -> np.int64:
+    """Convert a datetime to int64 nanoseconds since the epoch."""
+    return np.datetime64(timestamp, "ns").astype(np.int64)
+
+
+def _from_ns(ns: int) -> datetime:
+    """Convert int64 nanoseconds since the epoch back to a datetime."""
+    return np.datetime64(int(ns), "ns").astype("datetime64[us]").astype(datetime)
+
+
+def _welford_add(state: WelfordState, value: float) -> WelfordState:
+    """Fold a value into a Welford accumulator."""
+    n, mean, m2 = state
+    n += 1
+    delta = value - mean
+    mean += delta / n
+    return n, mean, m2 + delta * (value - mean)
+
+
+def _welford_remove(state: WelfordState, value: float) -> WelfordState:
+    """Reverse a Welford update, dropping a value previously folded in."""
+    n, mean, m2 = state
+    if n <= 1:
+        return 0, 0.0, 0.0
+    new_mean = (n * mean - value) / (n - 1)
+    return n - 1, new_mean, m2 - (value - mean) * (value - new_mean)
+
+
+def _welford_from(values: np.ndarray) -> WelfordState:
+    """Build a Welford accumulator directly from an array of values."""
+    if values.size == 0:
+        return 0, 0.0, 0.0
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(np.mean(values))
+    return values.size, mean, float(np.sum((values - mean) ** 2))
+
+
+@njit(cache=True)
+def _split_window_stats(ring, head, count, tail):
+    """Two-pass (historical mean, historical std, recent mean) over a ring, splitting off the last `tail` readings."""
+    size = ring.size
+    start = head - count
+    n_hist = count - tail
+    hist_sum = 0.0
+    recent_sum = 0.0
+    for k in range(count):
+        v = np.float64(ring[(start + k) % size])
+        if k < n_hist:
+            hist_sum += v
+        else:
+            recent_sum += v
+    hist_mean = hist_sum / n_hist
+    sq = 0.0
+    for k in range(n_hist):
+        d = np.float64(ring[(start + k) % size]) - hist_mean
+        sq += d * d
+    return hist_mean, np.sqrt(sq / n_hist), recent_sum / tail
+
+
+@njit(cache=True)
+def _hour_bucket_stats(ts_ns, values, ns_per_hour):
+    """Per-hour-of-day (count, sum, sum of squares) of a window in one pass."""
+    stats = np.zeros((24, 3))
+    for k in range(values.size):
+        hour = (ts_ns[k] // ns_per_hour) % 24
+        v = np.float64(values[k])
+        stats[hour, 0] += 1.0
+        stats[hour, 1] += v
+        stats[hour, 2] += v * v
+    return stats
+
+
+@njit(cache=True)
+def _merge_align(t1, t2, tolerance_ns):
+    """Pair indices of two time-sorted series whose timestamps lie within the tolerance."""
+    n1 = t1.size
+    n2 = t2.size
+    idx1 = np.empty(min(n1, n2), dtype=np.int64)
+    idx2 = np.empty(min(n1, n2), dtype=np.int64)
+    i = j = k = 0
+    while i < n1 and j < n2:
+        dt = t1[i] - t2[j]
+        if abs(dt) <= tolerance_ns:
+            idx1[k] = i
+            idx2[k] = j
+            k += 1
+            i += 1
+            j += 1
+        elif dt < 0:
+            i += 1
+        else:
+            j += 1
+    return idx1[:k], idx2[:k]
+
 
 class AnomalyType(Enum):
     """Types of anomalies that can be detected."""
@@ -53,6 +162,204 @@ class Anomaly:
     metadata: Dict[str, Any]
 
 
+# Compact integer codes for the enum-valued columns of AnomalyBuffer
+_ANOMALY_TYPES = list(AnomalyType)
+_ANOMALY_TYPE_CODES = {anomaly_type: code for code, anomaly_type in enumerate(_ANOMALY_TYPES)}
+_SEVERITY_LEVELS = list(SeverityLevel)
+_SEVERITY_CODES = {level: code for code, level in enumerate(_SEVERITY_LEVELS)}
+
+# Sensor types analyzed by energy spike detection
+_ENERGY_TYPES = frozenset({"energy_power", "energy_voltage", "energy_current", "energy_total"})
+
+# Shared recommendation lists, copied only when an Anomaly is materialized
+_ISOLATION_FOREST_RECOMMENDATIONS = ("Investigate sensor reading", "Check equipment status")
+_ENERGY_SPIKE_RECOMMENDATIONS = (
+    "Check for equipment malfunction",
+    "Verify load connections",
+    "Investigate unusual usage patterns"
+)
+_TEMPORAL_RECOMMENDATIONS = (
+    "Compare with historical patterns",
+    "Check for schedule changes",
+    "Verify sensor calibration"
+)
+_CORRELATION_RECOMMENDATIONS = (
+    "Check sensor connectivity",
+    "Verify both sensors are operational",
+    "Investigate environmental changes"
+)
+_NETWORK_RECOMMENDATIONS = (
+    "Check network connectivity",
+    "Verify sensor power supply",
+    "Inspect physical connections"
+)
+
+
+class AnomalyBuffer:
+    """
+    Columnar storage for detected anomalies.
+    
+    Anomalies are kept as parallel arrays (enum columns as integer codes, timestamps
+    as int64 nanoseconds) and only materialized as Anomaly objects when indexed or
+    iterated, so detection and summaries avoid per-anomaly object construction.
+    """
+    
+    _ARRAY_COLUMNS = ("_types", "_severities", "_timestamps", "_values", "_confidences", "_expected_ranges")
+    
+    def __init__(self, capacity: int = 16):
+        """Initialize an empty buffer with room for `capacity` anomalies."""
+        self._size = 0
+        self._types = np.empty(capacity, dtype=np.uint8)
+        self._severities = np.empty(capacity, dtype=np.uint8)
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._confidences = np.empty(capacity, dtype=np.float64)
+        self._expected_ranges = np.empty((capacity, 2), dtype=np.float64)
+        self.sensor_ids: List[str] = []
+        self.descriptions: List[str] = []
+        self.recommendations: List[Tuple[str, ...]] = []
+        self.metadata: List[Dict[str, Any]] = []
+    
+    @property
+    def types(self) -> np.ndarray:
+        """Anomaly type codes (indices into AnomalyType)."""
+        return self._types[:self._size]
+    
+    @property
+    def severities(self) -> np.ndarray:
+        """Severity codes, ordered from LOW (0) to CRITICAL (3)."""
+        return self._severities[:self._size]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Anomaly timestamps as int64 nanoseconds since the epoch."""
+        return self._timestamps[:self._size]
+    
+    @property
+    def values(self) -> np.ndarray:
+        """Sensor values at which the anomalies were detected."""
+        return self._values[:self._size]
+    
+    @property
+    def confidences(self) -> np.ndarray:
+        """Detection confidences (0.0 to 1.0)."""
+        return self._confidences[:self._size]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _reserve(self, extra: int) -> None:
+        """Grow the array columns to fit `extra` more anomalies."""
+        capacity = self._types.shape[0]
+        if self._size + extra <= capacity:
+            return
+        new_capacity = max(2 * capacity, self._size + extra)
+        for name in self._ARRAY_COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty((new_capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+    
+    def append(
+        self,
+        sensor_id: str,
+        anomaly_type: AnomalyType,
+        severity: SeverityLevel,
+        confidence: float,
+        timestamp_ns: int,
+        value: float,
+        expected_range: Tuple[float, float],
+        description: str,
+        recommendations: Tuple[str, ...],
+        metadata: Dict[str, Any]
+    ) -> None:
+        """Append one anomaly without constructing an Anomaly object."""
+        self._reserve(1)
+        k = self._size
+        self._types[k] = _ANOMALY_TYPE_CODES[anomaly_type]
+        self._severities[k] = _SEVERITY_CODES[severity]
+        self._timestamps[k] = timestamp_ns
+        self._values[k] = value
+        self._confidences[k] = confidence
+        self._expected_ranges[k] = expected_range
+        self.sensor_ids.append(sensor_id)
+        self.descriptions.append(description)
+        self.recommendations.append(recommendations)
+        self.metadata.append(metadata)
+        self._size += 1
+    
+    def extend(self, other: "AnomalyBuffer") -> None:
+        """Append all anomalies from another buffer."""
+        n = len(other)
+        if n == 0:
+            return
+        self._reserve(n)
+        for name in self._ARRAY_COLUMNS:
+            getattr(self, name)[self._size:self._size + n] = getattr(other, name)[:n]
+        self.sensor_ids.extend(other.sensor_ids)
+        self.descriptions.extend(other.descriptions)
+        self.recommendations.extend(other.recommendations)
+        self.metadata.extend(other.metadata)
+        self._size += n
+    
+    def take(self, indices) -> "AnomalyBuffer":
+        """Return a new buffer holding the anomalies at the given indices, in that order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        taken = AnomalyBuffer(capacity=max(len(indices), 1))
+        for name in self._ARRAY_COLUMNS:
+            getattr(taken, name)[:len(indices)] = getattr(self, name)[:self._size][indices]
+        taken.sensor_ids = [self.sensor_ids[k] for k in indices]
+        taken.descriptions = [self.descriptions[k] for k in indices]
+        taken.recommendations = [self.recommendations[k] for k in indices]
+        taken.metadata = [self.metadata[k] for k in indices]
+        taken._size = len(indices)
+        return taken
+    
+    def since(self, cutoff: datetime, sensor_id: Optional[str] = None) -> np.ndarray:
+        """Indices of anomalies at or after `cutoff`, optionally restricted to one sensor."""
+        mask = self.timestamps >= _to_ns(cutoff)
+        if sensor_id is not None:
+            mask &= np.asarray(self.sensor_ids, dtype=object) == sensor_id
+        return np.flatnonzero(mask)
+    
+    def at_least(self, severity: SeverityLevel) -> np.ndarray:
+        """Indices of anomalies whose severity is `severity` or higher."""
+        return np.flatnonzero(self.severities >= _SEVERITY_CODES[severity])
+    
+    def clear(self) -> None:
+        """Remove all anomalies."""
+        self._size = 0
+        self.sensor_ids.clear()
+        self.descriptions.clear()
+        self.recommendations.clear()
+        self.metadata.clear()
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(self._size)))
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("AnomalyBuffer index out of range")
+        low, high = self._expected_ranges[index]
+        return Anomaly(
+            sensor_id=self.sensor_ids[index],
+            anomaly_type=_ANOMALY_TYPES[self._types[index]],
+            severity=_SEVERITY_LEVELS[self._severities[index]],
+            confidence=float(self._confidences[index]),
+            timestamp=_from_ns(self._timestamps[index]),
+            value=float(self._values[index]),
+            expected_range=(float(low), float(high)),
+            description=self.descriptions[index],
+            recommendations=list(self.recommendations[index]),
+            metadata=self.metadata[index]
+        )
+    
+    def __iter__(self) -> Iterator[Anomaly]:
+        for index in range(self._size):
+            yield self[index]
+
+
 class AnomalyDetector:
     """
     Advanced anomaly detection system for smart building energy management.
@@ -90,14 +397,42 @@ class AnomalyDetector:
         self.isolation_forest = IsolationForest(
             contamination=contamination,
             random_state=42,
-            n_estimators=100
+            n_estimators=100,
+            n_jobs=-1
         )
         self.scaler = StandardScaler()
-        
-        # Data storage
-        self.sensor_data: Dict[str, List[Dict]] = {}
-        self.detected_anomalies: List[Anomaly] = []
+        # The forest is frozen between refits; detection only scores new windows against it
+        self.forest_max_samples = 256
+        self.refit_every_readings = 1000
+        self.refit_interval = timedelta(hours=1)
+        self._trained_at: Optional[datetime] = None
+        self._trained_samples = 0
+        self._readings_since_fit = 0
+        
+        # Data storage: per-sensor ring buffers (struct of arrays) written at a head cursor
+        self.values: Dict[str, np.ndarray] = {}
+        self.ts_ns: Dict[str, np.ndarray] = {}
+        self.head: Dict[str, int] = {}
+        self.count: Dict[str, int] = {}
+        self.sensor_types: Dict[str, str] = {}
+        self.is_energy: Dict[str, bool] = {}
+        # Sensors with readings added since they were last analyzed
+        self._dirty: set = set()
+        self.zone_ids: Dict[str, Optional[str]] = {}
+        self.sensor_metadata: Dict[str, Dict] = {}
+        # Per-sensor running (count, sum, sum of squares) of windowed values by hour of day
+        self.hour_stats: Dict[str, np.ndarray] = {}
+        # Per-sensor Welford accumulators over the whole window and its trailing RECENT_WINDOW readings
+        self.welford_full: Dict[str, WelfordState] = {}
+        self.welford_recent: Dict[str, WelfordState] = {}
+        # Row h lists ring slots in chronological order when the head cursor is at h
+        self._ring_order = (np.arange(window_size)[None, :] + np.arange(window_size)[:, None]) % window_size
+        self.detected_anomalies = AnomalyBuffer()
+        # Sensor network as node ids plus (M, 2) index pairs; the nx.Graph is built only on request
+        self.network_nodes: List[str] = []
+        self.network_edges = np.empty((0, 2), dtype=np.int64)
         self.network_graph: Optional[nx.Graph] = None
+        self._network_version: Optional[int] = None
         
         # Energy-specific thresholds
         self.energy_spike_threshold = 2.0  # Standard deviations
@@ -119,349 +454,414 @@ class AnomalyDetector:
         if timestamp is None:
             timestamp = datetime.now()
         
-        reading = {
-            "timestamp": timestamp,
-            "value": value,
-            "sensor_type": sensor_type,
-            "zone_id": zone_id,
-            "metadata": metadata or {}
-        }
-        
-        if sensor_id not in self.sensor_data:
-            self.sensor_data[sensor_id] = []
-        
-        self.sensor_data[sensor_id].append(reading)
-        
-        # Limit history size
-        if len(self.sensor_data[sensor_id]) > self.window_size:
-            self.sensor_data[sensor_id].pop(0)
+        if sensor_id not in self.values:
+            self.values[sensor_id] = np.empty(self.window_size, dtype=VALUE_DTYPE)
+            self.ts_ns[sensor_id] = np.empty(self.window_size, dtype=np.int64)
+            self.head[sensor_id] = 0
+            self.count[sensor_id] = 0
+            self.hour_stats[sensor_id] = np.zeros((24, 3))
+            self.welford_full[sensor_id] = (0, 0.0, 0.0)
+            self.welford_recent[sensor_id] = (0, 0.0, 0.0)
+        
+        head = self.head[sensor_id]
+        count = self.count[sensor_id]
+        ring = self.values[sensor_id]
+        hour_stats = self.hour_stats[sensor_id]
+        full = self.welford_full[sensor_id]
+        recent = self.welford_recent[sensor_id]
+        
+        # The reading one trailing-window length back leaves the trailing window
+        span = min(RECENT_WINDOW, self.window_size)
+        if count >= span:
+            recent = _welford_remove(recent, float(ring[(head - span) % self.window_size]))
+        
+        # Overwrite the oldest slot once the window is full, retiring it from the running stats
+        if count == self.window_size:
+            old_value = float(ring[head])
+            old_hour = (self.ts_ns[sensor_id][head] // NS_PER_HOUR) % 24
+            hour_stats[old_hour] -= (1.0, old_value, old_value * old_value)
+            full = _welford_remove(full, old_value)
+        
+        timestamp_ns = _to_ns(timestamp)
+        ring[head] = value
+        # Accumulate the stored single-precision value so evictions remove exactly what was added
+        value = float(ring[head])
+        self.ts_ns[sensor_id][head] = timestamp_ns
+        hour_stats[(timestamp_ns // NS_PER_HOUR) % 24] += (1.0, value, value * value)
+        self.head[sensor_id] = (head + 1) % self.window_size
+        self.count[sensor_id] = min(count + 1, self.window_size)
+        
+        if self.head[sensor_id] == 0 and self.count[sensor_id] == self.window_size:
+            # Resynchronize once per lap so rounding from reverse updates cannot accumulate
+            full = _welford_from(ring)
+            recent = _welford_from(ring[-RECENT_WINDOW:])
+            self.hour_stats[sensor_id] = _hour_bucket_stats(self.ts_ns[sensor_id], ring, NS_PER_HOUR)
+        else:
+            full = _welford_add(full, value)
+            recent = _welford_add(recent, value)
+        self.welford_full[sensor_id] = full
+        self.welford_recent[sensor_id] = recent
+        
+        self.sensor_types[sensor_id] = sensor_type
+        self.is_energy[sensor_id] = self._is_energy_sensor(sensor_type)
+        self.zone_ids[sensor_id] = zone_id
+        self.sensor_metadata[sensor_id] = metadata or {}
+        self._readings_since_fit += 1
+        self._dirty.add(sensor_id)
     
-    def detect_anomalies(self, sensor_ids: Optional[List[str]] = None) -> List[Anomaly]:
+    def _window(self, sensor_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return a sensor's (timestamps_ns, values) window in chronological order."""
+        count = self.count[sensor_id]
+        if count < self.window_size:
+            return self.ts_ns[sensor_id][:count], self.values[sensor_id][:count]
+        
+        order = self._ring_order[self.head[sensor_id]]
+        return np.take(self.ts_ns[sensor_id], order), np.take(self.values[sensor_id], order)
+    
+    def detect_anomalies(self, sensor_ids: Optional[List[str]] = None, force: bool = False) -> AnomalyBuffer:
         """
         Detect anomalies across all sensors or specified sensors.
         
+        Sensors without new readings since their last analysis are skipped.
+        
         Args:
             sensor_ids: List of sensor IDs to analyze (None = all sensors)
+            force: Analyze the sensors even if they have no new readings
             
         Returns:
-            List of detected anomalies
+            Buffer of detected anomalies (iterating it yields Anomaly objects)
         """
         if sensor_ids is None:
-            sensor_ids = list(self.sensor_data.keys())
-        
-        detected_anomalies = []
+            sensor_ids = list(self.values.keys())
+        if not force:
+            sensor_ids = [sensor_id for sensor_id in sensor_ids if sensor_id in self._dirty]
+        self._dirty.difference_update(sensor_ids)
+        
+        eligible_ids = [
+            sensor_id for sensor_id in sensor_ids
+            if self.count[sensor_id] >= self.min_samples_for_detection
+        ]
         
-        for sensor_id in sensor_ids:
-            if len(self.sensor_data[sensor_id]) < self.min_samples_for_detection:
-                continue
-            
-            # Run different detection methods
-            anomalies = []
-            
-            # 1. Isolation Forest (general anomaly detection)
-            isolation_anomalies = self._detect_isolation_forest_anomalies(sensor_id)
-            anomalies.extend(isolation_anomalies)
+        remaining_anomalies = AnomalyBuffer()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # 1. Isolation Forest (general anomaly detection), one model across all sensors.
+            # Scoring runs in sklearn's native code with the GIL released, so it overlaps
+            # with the lightweight detectors below.
+            forest_future = executor.submit(self._detect_isolation_forest_anomalies, eligible_ids)
             
-            # 2. Energy-specific detection
-            energy_anomalies = self._detect_energy_anomalies(sensor_id)
-            anomalies.extend(energy_anomalies)
+            for sensor_id in eligible_ids:
+                # Run different detection methods
+                
+                # 2. Energy-specific detection
+                energy_anomalies = self._detect_energy_anomalies(sensor_id)
+                remaining_anomalies.extend(energy_anomalies)
+                
+                # 3. Temporal pattern detection
+                temporal_anomalies = self._detect_temporal_anomalies(sensor_id)
+                remaining_anomalies.extend(temporal_anomalies)
             
-            # 3. Temporal pattern detection
-            temporal_anomalies = self._detect_temporal_anomalies(sensor_id)
-            anomalies.extend(temporal_anomalies)
+            # 4. Cross-sensor correlation analysis, batched per zone
+            correlation_anomalies = self._detect_correlation_anomalies(eligible_ids)
+            remaining_anomalies.extend(correlation_anomalies)
             
-            # 4. Cross-sensor correlation analysis
-            correlation_anomalies = self._detect_correlation_anomalies(sensor_id)
-            anomalies.extend(correlation_anomalies)
+            # 5. Network topology analysis (if enabled)
+            if self.network_analysis and self.network_nodes:
+                network_anomalies = self._detect_network_anomalies(eligible_ids)
+                remaining_anomalies.extend(network_anomalies)
             
-            detected_anomalies.extend(anomalies)
-        
-        # 5. Network topology analysis (if enabled)
-        if self.network_analysis and self.network_graph:
-            network_anomalies = self._detect_network_anomalies()
-            detected_anomalies.extend(network_anomalies)
+            detected_anomalies = forest_future.result()
+        detected_anomalies.extend(remaining_anomalies)
         
         # Store detected anomalies
         self.detected_anomalies.extend(detected_anomalies)
         
-        # Sort by severity and timestamp
-        detected_anomalies.sort(key=lambda x: (x.severity.value, x.timestamp), reverse=True)
+        # Sort by severity (most severe first), then newest first
+        order = np.lexsort((detected_anomalies.timestamps, detected_anomalies.severities))[::-1]
+        detected_anomalies = detected_anomalies.take(order)
         
         logger.info(f"Detected {len(detected_anomalies)} anomalies")
         return detected_anomalies
     
-    def _detect_isolation_forest_anomalies(self, sensor_id: str) -> List[Anomaly]:
-        """Detect anomalies using Isolation Forest algorithm."""
-        readings = self.sensor_data[sensor_id]
-        values = np.array([r["value"] for r in readings]).reshape(-1, 1)
-        
-        # Fit and predict
-        predictions = self.isolation_forest.fit_predict(values)
-        anomaly_scores = self.isolation_forest.decision_function(values)
-        
-        anomalies = []
-        for i, (prediction, score, reading) in enumerate(zip(predictions, anomaly_scores, readings)):
-            if prediction == -1:  # Anomaly detected
-                confidence = min(1.0, abs(score) / 0.5)  # Normalize score to confidence
-                severity = self._calculate_severity(confidence, reading["value"], readings)
-                
-                anomaly = Anomaly(
-                    sensor_id=sensor_id,
-                    anomaly_type=AnomalyType.UNKNOWN,
-                    severity=severity,
-                    confidence=confidence,
-                    timestamp=reading["timestamp"],
-                    value=reading["value"],
-                    expected_range=self._calculate_expected_range(readings),
-                    description=f"Isolation Forest detected anomaly (score: {score:.3f})",
-                    recommendations=["Investigate sensor reading", "Check equipment status"],
-                    metadata={"algorithm": "isolation_forest", "score": score}
-                )
-                anomalies.append(anomaly)
+    def _detect_isolation_forest_anomalies(self, sensor_ids: List[str]) -> AnomalyBuffer:
+        """Detect anomalies by scoring the given sensors against the shared Isolation Forest."""
+        if not sensor_ids:
+            return AnomalyBuffer()
+        
+        windows = [self._window(sensor_id) for sensor_id in sensor_ids]
+        
+        # Standardize each sensor's window so readings in different units share one model
+        standardized = []
+        for _, values in windows:
+            std = values.std()
+            standardized.append((values - values.mean()) / std if std > 0 else np.zeros_like(values))
+        X = np.concatenate(standardized).reshape(-1, 1)
+        sensor_idx = np.repeat(np.arange(len(windows)), [len(v) for _, v in windows])
+        offsets = np.cumsum([0] + [len(v) for _, v in windows])
+        
+        if self._forest_needs_refit(X.shape[0]):
+            self.isolation_forest.set_params(max_samples=min(self.forest_max_samples, X.shape[0]))
+            self.isolation_forest.fit(X)
+            self._trained_at = datetime.now()
+            self._trained_samples = X.shape[0]
+            self._readings_since_fit = 0
+        
+        # Score every reading against the current forest; negative scores are anomalies
+        anomaly_scores = self.isolation_forest.decision_function(X)
+        
+        anomalies = AnomalyBuffer()
+        expected_ranges: Dict[str, Tuple[float, float]] = {}
+        for flat_i in np.flatnonzero(anomaly_scores < 0):  # Anomalies detected
+            k = sensor_idx[flat_i]
+            i = flat_i - offsets[k]
+            sensor_id = sensor_ids[k]
+            timestamps, values = windows[k]
+            if sensor_id not in expected_ranges:
+                expected_ranges[sensor_id] = self._calculate_expected_range(sensor_id)
+            
+            score = anomaly_scores[flat_i]
+            confidence = min(1.0, abs(score) / 0.5)  # Normalize score to confidence
+            severity = self._calculate_severity(confidence, values[i], values)
+            
+            anomalies.append(
+                sensor_id=sensor_id,
+                anomaly_type=AnomalyType.UNKNOWN,
+                severity=severity,
+                confidence=confidence,
+                timestamp_ns=timestamps[i],
+                value=values[i],
+                expected_range=expected_ranges[sensor_id],
+                description=f"Isolation Forest detected anomaly (score: {score:.3f})",
+                recommendations=_ISOLATION_FOREST_RECOMMENDATIONS,
+                metadata={"algorithm": "isolation_forest", "score": score}
+            )
         
         return anomalies
     
-    def _detect_energy_anomalies(self, sensor_id: str) -> List[Anomaly]:
+    def _forest_needs_refit(self, n_samples: int) -> bool:
+        """Decide whether the shared Isolation Forest should be retrained on the current windows."""
+        if self._trained_at is None:
+            return True
+        # Keep refitting until the forest has seen a full subsample
+        if self._trained_samples < self.forest_max_samples and n_samples > self._trained_samples:
+            return True
+        return (self._readings_since_fit >= self.refit_every_readings or
+                datetime.now() - self._trained_at >= self.refit_interval)
+    
+    def _detect_energy_anomalies(self, sensor_id: str) -> AnomalyBuffer:
         """Detect energy-specific anomalies."""
-        readings = self.sensor_data[sensor_id]
-        latest_reading = readings[-1]
-        
         # Only analyze energy-related sensors
-        if not self._is_energy_sensor(latest_reading["sensor_type"]):
-            return []
+        if not self.is_energy.get(sensor_id):
+            return AnomalyBuffer()
         
-        anomalies = []
-        values = [r["value"] for r in readings]
+        anomalies = AnomalyBuffer()
+        n_full, full_mean, full_m2 = self.welford_full[sensor_id]
+        n_recent, recent_mean, recent_m2 = self.welford_recent[sensor_id]
         
         # Energy spike detection
-        if len(values) >= 10:
-            recent_mean = np.mean(values[-10:])
-            historical_mean = np.mean(values[:-10]) if len(values) > 10 else recent_mean
-            historical_std = np.std(values[:-10]) if len(values) > 10 else np.std(values)
+        if n_full >= RECENT_WINDOW:
+            n_hist = n_full - n_recent
+            if n_hist > 0:
+                # Split the historical part off the full window (Chan's parallel formula in reverse)
+                historical_mean = (n_full * full_mean - n_recent * recent_mean) / n_hist
+                delta = recent_mean - historical_mean
+                historical_m2 = full_m2 - recent_m2 - delta * delta * n_hist * n_recent / n_full
+                if historical_m2 <= 1e-9 * n_hist * max(historical_mean * historical_mean, 1.0):
+                    # Variance is within rounding noise of the running sums; recompute exactly
+                    historical_mean, historical_std, recent_mean = _split_window_stats(
+                        self.values[sensor_id], self.head[sensor_id], n_full, n_recent
+                    )
+                else:
+                    historical_std = np.sqrt(historical_m2 / n_hist)
+            else:
+                historical_mean = recent_mean
+                historical_std = np.sqrt(max(full_m2, 0.0) / n_full)
             
             if historical_std > 0:
                 z_score = (recent_mean - historical_mean) / historical_std
                 
                 if abs(z_score) > self.energy_spike_threshold:
                     severity = SeverityLevel.HIGH if abs(z_score) > 3.0 else SeverityLevel.MEDIUM
+                    latest = (self.head[sensor_id] - 1) % self.window_size
                     
-                    anomaly = Anomaly(
+                    anomalies.append(
                         sensor_id=sensor_id,
                         anomaly_type=AnomalyType.ENERGY_SPIKE,
                         severity=severity,
                         confidence=min(1.0, abs(z_score) / 3.0),
-                        timestamp=latest_reading["timestamp"],
-                        value=latest_reading["value"],
+                        timestamp_ns=self.ts_ns[sensor_id][latest],
+                        value=self.values[sensor_id][latest],
                         expected_range=(historical_mean - 2*historical_std, historical_mean + 2*historical_std),
                         description=f"Energy spike detected (z-score: {z_score:.2f})",
-                        recommendations=[
-                            "Check for equipment malfunction",
-                            "Verify load connections",
-                            "Investigate unusual usage patterns"
-                        ],
+                        recommendations=_ENERGY_SPIKE_RECOMMENDATIONS,
                         metadata={"z_score": z_score, "historical_mean": historical_mean}
                     )
-                    anomalies.append(anomaly)
         
         return anomalies
     
-    def _detect_temporal_anomalies(self, sensor_id: str) -> List[Anomaly]:
+    def _detect_temporal_anomalies(self, sensor_id: str) -> AnomalyBuffer:
         """Detect anomalies based on temporal patterns."""
-        readings = self.sensor_data[sensor_id]
-        
-        if len(readings) < 24:  # Need at least 24 readings for temporal analysis
-            return []
-        
-        anomalies = []
-        
-        # Convert to DataFrame for easier time-based analysis
-        df = pd.DataFrame(readings)
-        df['hour'] = df['timestamp'].dt.hour
-        df['weekday'] = df['timestamp'].dt.weekday
+        if self.count[sensor_id] < 24:  # Need at least 24 readings for temporal analysis
+            return AnomalyBuffer()
         
-        # Detect anomalies in hourly patterns
-        hourly_patterns = df.groupby('hour')['value'].agg(['mean', 'std']).fillna(0)
+        anomalies = AnomalyBuffer()
+        latest = (self.head[sensor_id] - 1) % self.window_size
+        latest_timestamp = self.ts_ns[sensor_id][latest]
+        latest_value = self.values[sensor_id][latest]
+        current_hour = (latest_timestamp // NS_PER_HOUR) % 24
         
-        latest_reading = readings[-1]
-        current_hour = latest_reading["timestamp"].hour
+        # Hourly pattern statistics (sample std) from the running accumulators
+        n, total, total_sq = self.hour_stats[sensor_id][current_hour]
         
-        if current_hour in hourly_patterns.index:
-            expected_mean = hourly_patterns.loc[current_hour, 'mean']
-            expected_std = hourly_patterns.loc[current_hour, 'std']
+        if n > 0:
+            expected_mean = total / n
+            expected_std = np.sqrt(max(total_sq - n * expected_mean ** 2, 0.0) / (n - 1)) if n > 1 else 0.0
             
+            # Detect anomalies in hourly patterns
             if expected_std > 0:
-                deviation = abs(latest_reading["value"] - expected_mean) / expected_std
+                deviation = abs(latest_value - expected_mean) / expected_std
                 
                 if deviation > 2.5:  # Significant deviation from hourly pattern
                     severity = SeverityLevel.HIGH if deviation > 4.0 else SeverityLevel.MEDIUM
                     
-                    anomaly = Anomaly(
+                    anomalies.append(
                         sensor_id=sensor_id,
                         anomaly_type=AnomalyType.SEASONAL_DEVIATION,
                         severity=severity,
                         confidence=min(1.0, deviation / 4.0),
-                        timestamp=latest_reading["timestamp"],
-                        value=latest_reading["value"],
+                        timestamp_ns=latest_timestamp,
+                        value=latest_value,
                         expected_range=(expected_mean - 2*expected_std, expected_mean + 2*expected_std),
                         description=f"Unusual value for time of day (deviation: {deviation:.2f}σ)",
-                        recommendations=[
-                            "Compare with historical patterns",
-                            "Check for schedule changes",
-                            "Verify sensor calibration"
-                        ],
+                        recommendations=_TEMPORAL_RECOMMENDATIONS,
                         metadata={"hourly_deviation": deviation, "expected_mean": expected_mean}
                     )
-                    anomalies.append(anomaly)
         
         return anomalies
     
-    def _detect_correlation_anomalies(self, sensor_id: str) -> List[Anomaly]:
-        """Detect anomalies based on correlations with other sensors."""
-        if len(self.sensor_data) < 2:
-            return []
-        
-        anomalies = []
-        target_readings = self.sensor_data[sensor_id]
-        target_zone = target_readings[-1].get("zone_id")
-        
-        # Find correlated sensors (same zone or similar type)
-        correlated_sensors = []
-        for other_id, other_readings in self.sensor_data.items():
-            if other_id == sensor_id or len(other_readings) < self.min_samples_for_detection:
+    def _detect_correlation_anomalies(self, sensor_ids: List[str]) -> AnomalyBuffer:
+        """Detect anomalies based on correlations with other sensors in the same zone."""
+        if len(self.values) < 2:
+            return AnomalyBuffer()
+        
+        anomalies = AnomalyBuffer()
+        targets = set(sensor_ids)
+        zones = {self.zone_ids[sensor_id] for sensor_id in sensor_ids if self.zone_ids[sensor_id]}
+        
+        for zone_id in zones:
+            member_ids, M = self._zone_matrix(zone_id)
+            if len(member_ids) < 2 or M.shape[1] < 10:
                 continue
             
-            # Check if sensors are related
-            other_zone = other_readings[-1].get("zone_id")
-            if target_zone and other_zone == target_zone:
-                correlated_sensors.append(other_id)
-        
-        if not correlated_sensors:
-            return []
-        
-        # Analyze correlation patterns
-        for other_id in correlated_sensors:
-            anomaly = self._analyze_sensor_correlation(sensor_id, other_id)
-            if anomaly:
-                anomalies.append(anomaly)
+            # Every pair's full-window and recent correlation in two calls
+            full_corr = np.corrcoef(M)
+            recent_corr = np.corrcoef(M[:, -10:])
+            
+            # Detect sudden correlation breakdown (NaN correlations never compare true)
+            breakdown = np.abs(full_corr - recent_corr) > 0.5
+            np.fill_diagonal(breakdown, False)
+            
+            for i, j in np.argwhere(breakdown):
+                sensor_id = member_ids[i]
+                if sensor_id not in targets:
+                    continue
+                
+                other_id = member_ids[j]
+                timestamps, values = self._window(sensor_id)
+                anomalies.append(
+                    sensor_id=sensor_id,
+                    anomaly_type=AnomalyType.NETWORK_ISOLATION,
+                    severity=SeverityLevel.MEDIUM,
+                    confidence=abs(full_corr[i, j] - recent_corr[i, j]),
+                    timestamp_ns=timestamps[-1],
+                    value=values[-1],
+                    expected_range=self._calculate_expected_range(sensor_id),
+                    description=f"Correlation breakdown with sensor {other_id}",
+                    recommendations=_CORRELATION_RECOMMENDATIONS,
+                    metadata={
+                        "historical_correlation": full_corr[i, j],
+                        "recent_correlation": recent_corr[i, j],
+                        "correlated_sensor": other_id
+                    }
+                )
         
         return anomalies
     
-    def _analyze_sensor_correlation(self, sensor1_id: str, sensor2_id: str) -> Optional[Anomaly]:
-        """Analyze correlation between two sensors."""
-        readings1 = self.sensor_data[sensor1_id]
-        readings2 = self.sensor_data[sensor2_id]
-        
-        # Align timestamps and get common readings
-        common_readings = self._align_sensor_readings(readings1, readings2)
-        
-        if len(common_readings) < 10:
-            return None
-        
-        values1 = [r[0] for r in common_readings]
-        values2 = [r[1] for r in common_readings]
-        
-        # Calculate correlation
-        correlation = np.corrcoef(values1, values2)[0, 1]
-        
-        if np.isnan(correlation):
-            return None
-        
-        # Detect sudden correlation breakdown
-        recent_corr = np.corrcoef(values1[-10:], values2[-10:])[0, 1]
-        
-        if not np.isnan(recent_corr) and abs(correlation - recent_corr) > 0.5:
-            latest_reading = readings1[-1]
-            
-            return Anomaly(
-                sensor_id=sensor1_id,
-                anomaly_type=AnomalyType.NETWORK_ISOLATION,
-                severity=SeverityLevel.MEDIUM,
-                confidence=abs(correlation - recent_corr),
-                timestamp=latest_reading["timestamp"],
-                value=latest_reading["value"],
-                expected_range=self._calculate_expected_range(readings1),
-                description=f"Correlation breakdown with sensor {sensor2_id}",
-                recommendations=[
-                    "Check sensor connectivity",
-                    "Verify both sensors are operational",
-                    "Investigate environmental changes"
-                ],
-                metadata={
-                    "historical_correlation": correlation,
-                    "recent_correlation": recent_corr,
-                    "correlated_sensor": sensor2_id
-                }
-            )
+    def _zone_matrix(self, zone_id: str) -> Tuple[List[str], np.ndarray]:
+        """
+        Align a zone's sensors onto a shared timeline.
         
-        return None
+        Returns the member sensor IDs and an (n_sensors, T) matrix holding, for each
+        reference timestamp matched by every member within 1 minute, their values.
+        """
+        member_ids = [
+            sensor_id for sensor_id, sensor_zone in self.zone_ids.items()
+            if sensor_zone == zone_id and self.count[sensor_id] >= self.min_samples_for_detection
+        ]
+        if len(member_ids) < 2:
+            return member_ids, np.empty((len(member_ids), 0))
+        
+        # Use the first member's timestamps as the reference grid
+        reference_ts, _ = self._window(member_ids[0])
+        M = np.full((len(member_ids), reference_ts.size), np.nan)
+        for row, sensor_id in enumerate(member_ids):
+            timestamps, values = self._window(sensor_id)
+            ref_idx, idx = _merge_align(reference_ts, timestamps, 60 * NS_PER_SECOND)
+            M[row, ref_idx] = values[idx]
+        
+        # Keep only the timestamps every member was matched on
+        return member_ids, M[:, ~np.isnan(M).any(axis=0)]
     
-    def _detect_network_anomalies(self) -> List[Anomaly]:
-        """Detect network-level anomalies using graph analysis."""
-        if not self.network_graph:
-            return []
+    def _detect_network_anomalies(self, sensor_ids: List[str]) -> AnomalyBuffer:
+        """Detect network-level anomalies among the given sensors using graph analysis."""
+        if not self.network_nodes:
+            return AnomalyBuffer()
         
-        anomalies = []
+        anomalies = AnomalyBuffer()
         
-        # Analyze network connectivity
-        isolated_nodes = []
-        for node in self.network_graph.nodes():
-            if self.network_graph.degree(node) == 0:
-                isolated_nodes.append(node)
+        # Analyze network connectivity: isolated sensors have no incident edges
+        degree = np.bincount(self.network_edges.ravel(), minlength=len(self.network_nodes))
         
         # Create anomalies for isolated sensors
-        for sensor_id in isolated_nodes:
-            if sensor_id in self.sensor_data and self.sensor_data[sensor_id]:
-                latest_reading = self.sensor_data[sensor_id][-1]
+        targets = set(sensor_ids)
+        for k in np.flatnonzero(degree == 0):
+            sensor_id = self.network_nodes[k]
+            if sensor_id in targets:
+                latest = (self.head[sensor_id] - 1) % self.window_size
                 
-                anomaly = Anomaly(
+                anomalies.append(
                     sensor_id=sensor_id,
                     anomaly_type=AnomalyType.NETWORK_ISOLATION,
                     severity=SeverityLevel.HIGH,
                     confidence=1.0,
-                    timestamp=latest_reading["timestamp"],
-                    value=latest_reading["value"],
-                    expected_range=self._calculate_expected_range(self.sensor_data[sensor_id]),
+                    timestamp_ns=self.ts_ns[sensor_id][latest],
+                    value=self.values[sensor_id][latest],
+                    expected_range=self._calculate_expected_range(sensor_id),
                     description="Sensor isolated from network",
-                    recommendations=[
-                        "Check network connectivity",
-                        "Verify sensor power supply",
-                        "Inspect physical connections"
-                    ],
+                    recommendations=_NETWORK_RECOMMENDATIONS,
                     metadata={"network_degree": 0}
                 )
-                anomalies.append(anomaly)
         
         return anomalies
     
-    def update_network_graph(self, building) -> None:
-        """Update the network graph from a building object."""
-        if hasattr(building, 'get_sensor_network_graph'):
-            self.network_graph = building.get_sensor_network_graph()
+    def update_network_graph(self, building, build_graph: bool = False) -> None:
+        """Update the sensor network from a building object, optionally also as an nx.Graph."""
+        if hasattr(building, 'get_sensor_network_edges'):
+            # Nothing to do while the building's sensor set is unchanged
+            version = getattr(building, 'sensor_graph_version', None)
+            if (version is not None and version == self._network_version and
+                    (not build_graph or self.network_graph is not None)):
+                return
+            self._network_version = version
+            self.network_nodes, self.network_edges = building.get_sensor_network_edges()
+            # Drop a graph built for an older sensor set rather than keep it stale
+            self.network_graph = building.get_sensor_network_graph() if build_graph else None
             logger.debug("Updated sensor network graph")
     
-    def _align_sensor_readings(self, readings1: List[Dict], readings2: List[Dict]) -> List[Tuple[float, float]]:
-        """Align readings from two sensors by timestamp."""
-        aligned = []
-        
-        # Create timestamp-indexed dictionaries
-        dict1 = {r["timestamp"]: r["value"] for r in readings1}
-        dict2 = {r["timestamp"]: r["value"] for r in readings2}
-        
-        # Find common timestamps (within 1 minute tolerance)
-        for ts1, val1 in dict1.items():
-            for ts2, val2 in dict2.items():
-                if abs((ts1 - ts2).total_seconds()) <= 60:  # 1 minute tolerance
-                    aligned.append((val1, val2))
-                    break
-        
-        return aligned
-    
     def _is_energy_sensor(self, sensor_type: str) -> bool:
         """Check if sensor type is energy-related."""
-        energy_types = ["energy_power", "energy_voltage", "energy_current", "energy_total"]
-        return sensor_type in energy_types
+        return sensor_type in _ENERGY_TYPES
     
-    def _calculate_severity(self, confidence: float, value: float, readings: List[Dict]) -> SeverityLevel:
+    def _calculate_severity(self, confidence: float, value: float, values: np.ndarray) -> SeverityLevel:
         """Calculate severity level based on confidence and value deviation."""
         if confidence > 0.8:
             return SeverityLevel.CRITICAL
@@ -472,35 +872,37 @@ class AnomalyDetector:
         else:
             return SeverityLevel.LOW
     
-    def _calculate_expected_range(self, readings: List[Dict]) -> Tuple[float, float]:
+    def _calculate_expected_range(self, sensor_id: str) -> Tuple[float, float]:
         """Calculate expected range based on historical data."""
-        values = [r["value"] for r in readings]
-        mean = np.mean(values)
-        std = np.std(values)
+        n, mean, m2 = self.welford_full[sensor_id]
+        std = np.sqrt(max(m2, 0.0) / n)
         return (mean - 2*std, mean + 2*std)
     
     def get_anomaly_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get summary of anomalies in the last N hours."""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_anomalies = [
-            a for a in self.detected_anomalies
-            if a.timestamp >= cutoff_time
-        ]
+        anomalies = self.detected_anomalies
+        recent_idx = anomalies.since(cutoff_time)
+        severities = anomalies.severities[recent_idx]
+        severity_counts = np.bincount(severities, minlength=len(_SEVERITY_LEVELS))
+        type_counts = np.bincount(anomalies.types[recent_idx], minlength=len(_ANOMALY_TYPES))
+        critical_code = _SEVERITY_CODES[SeverityLevel.CRITICAL]
         
         summary = {
-            "total_anomalies": len(recent_anomalies),
+            "total_anomalies": len(recent_idx),
             "by_severity": {
-                level.value: len([a for a in recent_anomalies if a.severity == level])
-                for level in SeverityLevel
+                level.value: int(severity_counts[code])
+                for code, level in enumerate(_SEVERITY_LEVELS)
             },
             "by_type": {
-                atype.value: len([a for a in recent_anomalies if a.anomaly_type == atype])
-                for atype in AnomalyType
+                atype.value: int(type_counts[code])
+                for code, atype in enumerate(_ANOMALY_TYPES)
             },
-            "most_recent": recent_anomalies[0].timestamp.isoformat() if recent_anomalies else None,
+            "most_recent": (
+                _from_ns(anomalies.timestamps[recent_idx[0]]).isoformat() if len(recent_idx) else None
+            ),
             "critical_sensors": list(set([
-                a.sensor_id for a in recent_anomalies 
-                if a.severity == SeverityLevel.CRITICAL
+                anomalies.sensor_ids[k] for k in recent_idx[severities == critical_code]
             ]))
         }
         
@@ -511,10 +913,7 @@ class AnomalyDetector:
         cutoff_time = datetime.now() - timedelta(days=days)
         initial_count = len(self.detected_anomalies)
         
-        self.detected_anomalies = [
-            a for a in self.detected_anomalies
-            if a.timestamp >= cutoff_time
-        ]
+        self.detected_anomalies = self.detected_anomalies.take(self.detected_anomalies.since(cutoff_time))
         
         removed_count = initial_count - len(self.detected_anomalies)
         logger.info(f"Removed {removed_count} old anomalies")
@@ -7,13 +7,17 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import numpy as np
 from loguru import logger
+from scipy.spatial import cKDTree
 
-from ..sensors.base_sensor import BaseSensor
+from ..sensors.base_sensor import BaseSensor, take_readings
 from ..sensors.hvac_sensor import HVACSensor
 from ..sensors.lighting_sensor import LightingSensor
 from ..sensors.occupancy_sensor import OccupancySensor
 from ..sensors.energy_meter import EnergyMeter
 
+# Sensors closer than this (meters) are linked in the sensor network graph
+SENSOR_LINK_RANGE = 20.0
+
 
 @dataclass
 class Zone:
@@ -74,23 +78,82 @@ class Building:
         self.zones: Dict[str, Zone] = {}
         self.sensors: Dict[str, BaseSensor] = {}
         self.created_at = datetime.now()
+        # (sensor ids, (N, 3) positions) cached for vectorized distance queries
+        self._position_index: Optional[Tuple[List[str], np.ndarray]] = None
+        # (zone sensor count, energy meters, occupancy sensors grouped by zone, group starts)
+        self._totals_index: Optional[Tuple[int, List[BaseSensor], List[BaseSensor], np.ndarray]] = None
+        # Building totals, dropped by the indexed sensors' value listeners when a reading changes
+        self._occupancy_total: Optional[int] = None
+        self._energy_total: Optional[float] = None
+        # Number of ACTIVE sensors, kept current through each sensor's status listener
+        self._active_count = 0
+        # Bumped whenever the sensor network may change; edges for sensors added since the
+        # last query are patched into the cached (ids, edges) instead of rebuilding it
+        self.sensor_graph_version = 0
+        self._network_edges: Optional[Tuple[List[str], np.ndarray]] = None
+        self._pending_network_ids: List[str] = []
+        # Failure and noise samples for take_all_readings, drawn for all sensors at once
+        self._rng = np.random.default_rng()
         
         logger.info(f"Initialized building: {building_info.name}")
     
     def add_zone(self, zone: Zone) -> None:
         """Add a zone to the building."""
         self.zones[zone.id] = zone
+        self._totals_index = None
         logger.info(f"Added zone {zone.name} to building {self.info.name}")
     
     def add_sensor(self, sensor: BaseSensor, zone_id: Optional[str] = None) -> None:
         """Add a sensor to the building and optionally to a specific zone."""
+        if sensor.id in self.sensors:
+            # Replacing a sensor may move or rezone it, so the cached edges cannot be patched
+            self._network_edges = None
+            self._detach_sensor(self.sensors[sensor.id])
         self.sensors[sensor.id] = sensor
+        sensor._status_listener = self._on_sensor_status_change
+        self._active_count += sensor.is_active()
+        self._position_index = None
+        self._totals_index = None
+        self.sensor_graph_version += 1
+        self._pending_network_ids.append(sensor.id)
         
         if zone_id and zone_id in self.zones:
             self.zones[zone_id].add_sensor(sensor)
         
         logger.debug(f"Added sensor {sensor.id} ({sensor.sensor_type}) to building")
     
+    def remove_sensor(self, sensor_id: str) -> bool:
+        """Remove a sensor from the building and its zone."""
+        sensor = self.sensors.pop(sensor_id, None)
+        if sensor is None:
+            return False
+        self._detach_sensor(sensor)
+        
+        zone = self.zones.get(getattr(sensor, 'zone_id', None))
+        if zone and sensor in zone.sensors:
+            zone.sensors.remove(sensor)
+        self._position_index = None
+        self._totals_index = None
+        self.sensor_graph_version += 1
+        self._network_edges = None
+        
+        logger.debug(f"Removed sensor {sensor_id} from building")
+        return True
+    
+    def _detach_sensor(self, sensor: BaseSensor) -> None:
+        """Stop tracking a sensor's status changes."""
+        sensor._status_listener = None
+        sensor._value_listener = None
+        self._active_count -= sensor.is_active()
+    
+    def _on_sensor_status_change(self, sensor: BaseSensor, is_active: bool) -> None:
+        """Update the active sensor count when a sensor enters or leaves ACTIVE."""
+        self._active_count += 1 if is_active else -1
+    
+    def get_active_sensor_count(self) -> int:
+        """Get the number of sensors currently ACTIVE."""
+        return self._active_count
+    
     def get_zone(self, zone_id: str) -> Optional[Zone]:
         """Get a zone by ID."""
         return self.zones.get(zone_id)
@@ -113,11 +176,82 @@ class Building:
     
     def get_total_occupancy(self) -> int:
         """Get total current occupancy of the building."""
-        return sum(zone.get_current_occupancy() for zone in self.zones.values())
+        _, _, occupancy_sensors, group_starts = self._get_totals_index()
+        if self._occupancy_total is not None:
+            return self._occupancy_total
+        if not occupancy_sensors:
+            self._occupancy_total = 0
+            return 0
+        
+        # Each zone reports its busiest occupancy sensor
+        readings = np.fromiter(
+            (int(sensor.get_current_reading()) for sensor in occupancy_sensors),
+            dtype=np.int64, count=len(occupancy_sensors)
+        )
+        self._occupancy_total = int(np.maximum.reduceat(readings, group_starts).sum())
+        return self._occupancy_total
     
     def get_total_energy_consumption(self) -> float:
         """Get total current energy consumption of the building."""
-        return sum(zone.get_energy_consumption() for zone in self.zones.values())
+        _, energy_meters, _, _ = self._get_totals_index()
+        if self._energy_total is None:
+            self._energy_total = float(np.fromiter(
+                (sensor.get_current_reading() for sensor in energy_meters),
+                dtype=np.float64, count=len(energy_meters)
+            ).sum())
+        return self._energy_total
+    
+    def _on_occupancy_change(self, sensor: BaseSensor) -> None:
+        """Drop the cached occupancy total when an occupancy sensor's reading changes."""
+        self._occupancy_total = None
+    
+    def _on_energy_change(self, sensor: BaseSensor) -> None:
+        """Drop the cached energy total when an energy meter's reading changes."""
+        self._energy_total = None
+    
+    def _get_totals_index(self) -> Tuple[int, List[BaseSensor], List[BaseSensor], np.ndarray]:
+        """Get the zone energy meters and zone-grouped occupancy sensors behind the building totals."""
+        # Sensor counts also catch sensors attached through Zone.add_sensor directly
+        zone_sensor_count = sum(len(zone.sensors) for zone in self.zones.values())
+        if self._totals_index is None or self._totals_index[0] != zone_sensor_count:
+            energy_meters: List[BaseSensor] = []
+            occupancy_sensors: List[BaseSensor] = []
+            group_starts: List[int] = []
+            for zone in self.zones.values():
+                energy_meters.extend(zone.get_sensors_by_type("energy_meter"))
+                zone_occupancy = zone.get_sensors_by_type("occupancy")
+                if zone_occupancy:
+                    group_starts.append(len(occupancy_sensors))
+                    occupancy_sensors.extend(zone_occupancy)
+            # Zone sensors need not be registered with the building, so listen here
+            for sensor in energy_meters:
+                sensor._value_listener = self._on_energy_change
+            for sensor in occupancy_sensors:
+                sensor._value_listener = self._on_occupancy_change
+            self._occupancy_total = None
+            self._energy_total = None
+            self._totals_index = (
+                zone_sensor_count, energy_meters, occupancy_sensors, np.array(group_starts, dtype=np.intp)
+            )
+        return self._totals_index
+    
+    def take_all_readings(self, now: Optional[datetime] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Take one reading from every sensor in a single batched pass.
+        
+        Returns:
+            (sensor ids, (sensors,) reading values with NaN for sensors that could not be read)
+        """
+        sensor_ids = list(self.sensors)
+        sensors = list(self.sensors.values())
+        results = take_readings(
+            sensors, self._rng.random(len(sensors)), self._rng.standard_normal(len(sensors)), now
+        )
+        values = np.fromiter(
+            (np.nan if isinstance(reading, Exception) else reading.value for reading in results),
+            dtype=np.float64, count=len(results)
+        )
+        return sensor_ids, values
     
     def get_building_summary(self) -> Dict:
         """Get a comprehensive summary of the building state."""
@@ -169,6 +303,67 @@ class Building:
             if hasattr(sensor, 'simulate_reading'):
                 sensor.simulate_reading(timestep)
     
+    def get_sensor_network_edges(self) -> Tuple[List[str], np.ndarray]:
+        """Get sensor ids and the (M, 2) index pairs of sensors linked by proximity or a shared zone."""
+        ids, positions = self._get_position_index()
+        cached = self._network_edges
+        pending = self._pending_network_ids
+        
+        if cached is not None and cached[0] + pending == ids:
+            if pending:
+                cached = (ids, self._extend_network_edges(cached[1], positions, len(cached[0])))
+        else:
+            cached = (ids, self._build_network_edges(positions))
+        
+        self._network_edges = cached
+        self._pending_network_ids = []
+        return cached
+    
+    def _build_network_edges(self, positions: np.ndarray) -> np.ndarray:
+        """Compute every network edge from scratch."""
+        sensor_list = list(self.sensors.values())
+        if not sensor_list:
+            return np.empty((0, 2), dtype=np.int64)
+        
+        # Connect sensors within range, using a KD-tree instead of testing every pair
+        pairs = cKDTree(positions).query_pairs(r=SENSOR_LINK_RANGE, output_type='ndarray')
+        # query_pairs is inclusive of r; the link range is strict
+        gaps = np.linalg.norm(positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=1)
+        edge_blocks = [pairs[gaps < SENSOR_LINK_RANGE].astype(np.int64)]
+        
+        # Connect every pair of sensors sharing a zone
+        zone_members: Dict[Optional[str], List[int]] = {}
+        for index, sensor in enumerate(sensor_list):
+            zone_members.setdefault(getattr(sensor, 'zone_id', None), []).append(index)
+        for members in zone_members.values():
+            members = np.asarray(members, dtype=np.int64)
+            rows, cols = np.triu_indices(len(members), k=1)
+            edge_blocks.append(np.column_stack((members[rows], members[cols])))
+        
+        return np.unique(np.concatenate(edge_blocks), axis=0)
+    
+    def _extend_network_edges(self, edges: np.ndarray, positions: np.ndarray, n_known: int) -> np.ndarray:
+        """Add the edges of sensors appended after the first `n_known` to existing edges."""
+        new_idx = np.arange(n_known, positions.shape[0])
+        if new_idx.size * positions.shape[0] > 4_000_000:
+            # Too many new sensors for the dense distance block; rebuild instead
+            return self._build_network_edges(positions)
+        
+        # Distances from each new sensor to every sensor, including the other new ones
+        gaps = np.linalg.norm(positions[None, :, :] - positions[new_idx, None, :], axis=-1)
+        rows, cols = np.nonzero(gaps < SENSOR_LINK_RANGE)
+        edge_blocks = [edges, np.column_stack((new_idx[rows], cols))]
+        
+        zones = np.array([getattr(sensor, 'zone_id', None) for sensor in self.sensors.values()], dtype=object)
+        for index in new_idx:
+            members = np.flatnonzero(zones == zones[index])
+            edge_blocks.append(np.column_stack((np.full(members.size, index), members)))
+        
+        # Orient every pair as (low, high) and drop self-links and duplicates
+        pairs = np.sort(np.concatenate(edge_blocks).astype(np.int64), axis=1)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        return np.unique(pairs, axis=0)
+    
     def get_sensor_network_graph(self):
         """Get network graph representation of sensor connectivity."""
         try:
@@ -183,14 +378,8 @@ class Building:
                           zone_id=getattr(sensor, 'zone_id', None),
                           position=sensor.position)
             
-            # Add edges based on proximity (simplified)
-            sensor_list = list(self.sensors.values())
-            for i, sensor1 in enumerate(sensor_list):
-                for sensor2 in sensor_list[i+1:]:
-                    # Connect sensors in the same zone or within range
-                    if (getattr(sensor1, 'zone_id', None) == getattr(sensor2, 'zone_id', None) or
-                        self._calculate_distance(sensor1.position, sensor2.position) < 20):
-                        G.add_edge(sensor1.id, sensor2.id)
+            ids, edges = self.get_sensor_network_edges()
+            G.add_edges_from((ids[i], ids[j]) for i, j in edges.tolist())
             
             return G
             
@@ -198,8 +387,17 @@ class Building:
             logger.warning("NetworkX not available for graph generation")
             return None
     
+    def _get_position_index(self) -> Tuple[List[str], np.ndarray]:
+        """Get sensor ids and their (N, 3) position matrix, rebuilt only when sensors change."""
+        # The length check also catches sensors added or removed directly through the dict
+        if self._position_index is None or len(self._position_index[0]) != len(self.sensors):
+            ids = list(self.sensors.keys())
+            positions = np.array([sensor.position for sensor in self.sensors.values()], dtype=float)
+            self._position_index = (ids, positions.reshape(len(ids), 3))
+        return self._position_index
+    
     @staticmethod
     def _calculate_distance(pos1: Tuple[float, float, float], 
                           pos2: Tuple[float, float, float]) -> float:
         """Calculate 3D distance between two positions."""
-        return np.sqrt(sum((a - b) ** 2 for a, b in zip(pos1, pos2)))
+        return float(np.linalg.norm(np.subtract(pos1, pos2)))
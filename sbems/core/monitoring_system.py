@@ -2,29 +2,236 @@
 Main monitoring system that coordinates building sensors and anomaly detection.
 """
 
+import asyncio
 import time
-from typing import Dict, List, Optional, Any
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Any, Sequence, TextIO, Tuple, Union
 from datetime import datetime, timedelta
 from threading import Thread, Event
+from concurrent.futures import Future
 from dataclasses import dataclass
 import json
+import numpy as np
 from loguru import logger
 
+try:
+    import orjson
+    
+    def _json_dumps(value: Any) -> str:
+        """Compact JSON text for one value, encoded in C by orjson."""
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    # orjson not installed: encode with the standard library
+    _json_dumps = json.dumps
+
+from .._compat import DATACLASS_SLOTS
 from .building import Building, Zone, BuildingInfo
-from ..sensors.base_sensor import BaseSensor
+from ..sensors.base_sensor import BaseSensor, SensorReading, take_readings
 from ..sensors.hvac_sensor import HVACSensor
 from ..sensors.lighting_sensor import LightingSensor
 from ..sensors.occupancy_sensor import OccupancySensor
 from ..sensors.energy_meter import EnergyMeter
-from ..analytics.anomaly_detector import AnomalyDetector, Anomaly
+from ..analytics.anomaly_detector import AnomalyDetector, AnomalyBuffer, SeverityLevel
+
+
+def _epoch_us(timestamp: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch."""
+    return int(timestamp.timestamp()) * 1_000_000 + timestamp.microsecond
+
+
+def epoch_us_to_iso(ts_us: int) -> str:
+    """Format integer epoch microseconds as a local ISO-8601 timestamp."""
+    seconds, micros = divmod(ts_us, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros).isoformat()
+
 
+def _with_iso_timestamp(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a history entry with its `ts_us` replaced by an ISO `timestamp`, for export."""
+    exported = {"timestamp": epoch_us_to_iso(entry["ts_us"])}
+    exported.update((key, value) for key, value in entry.items() if key != "ts_us")
+    return exported
+
+
+def _write_json_array(f: TextIO, rows: Iterable[Any]) -> None:
+    """Stream rows to `f` as a JSON array, one compact row per line."""
+    f.write("[")
+    for i, row in enumerate(rows):
+        f.write(",\n    " if i else "\n    ")
+        f.write(_json_dumps(row))
+    f.write("\n  ]")
+
+
+def _write_json_object(f: TextIO, items: Iterable[Tuple[str, Any]]) -> None:
+    """Stream (key, value) pairs to `f` as a JSON object, one compact member per line."""
+    f.write("{")
+    for i, (key, value) in enumerate(items):
+        f.write(",\n    " if i else "\n    ")
+        f.write(f"{_json_dumps(key)}: {_json_dumps(value)}")
+    f.write("\n  }")
+
+
+def _entries_since(entries: List[Dict[str, Any]], cutoff: datetime) -> List[Dict[str, Any]]:
+    """Entries of a time-ordered snapshot at or after `cutoff`, located by bisecting their `ts_us`."""
+    cutoff_us = _epoch_us(cutoff)
+    lo, hi = 0, len(entries)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if entries[mid]["ts_us"] < cutoff_us:
+            lo = mid + 1
+        else:
+            hi = mid
+    return entries[lo:]
 
-@dataclass
+
+class ReadingHistory:
+    """
+    Columnar ring buffer of per-tick reading snapshots.
+    
+    Each tick occupies one row of (capacity, sensors) value and quality arrays, with
+    NaN marking sensors that did not report; sensor attributes are stored once per
+    sensor column. Snapshot dicts are only built when entries are read back.
+    """
+    
+    _SUMMARY_FIELDS = ("total_occupancy", "total_energy_consumption", "active_sensors", "total_sensors")
+    _INT_SUMMARY_FIELDS = frozenset({"total_occupancy", "active_sensors", "total_sensors"})
+    
+    def __init__(self, capacity: int, sensor_capacity: int = 16):
+        """Initialize an empty history keeping the latest `capacity` ticks."""
+        self.capacity = capacity
+        self._head = 0
+        self._count = 0
+        self._stamps = np.zeros(capacity, dtype=np.int64)
+        self._values = np.full((capacity, sensor_capacity), np.nan)
+        self._qualities = np.full((capacity, sensor_capacity), np.nan)
+        self._summaries = np.zeros((capacity, len(self._SUMMARY_FIELDS)))
+        # Failed reads are rare, so their messages are kept per slot as {column: message}
+        self._errors: Dict[int, Dict[int, str]] = {}
+        self.sensor_ids: List[str] = []
+        self._columns: Dict[str, int] = {}
+        # (unit, sensor_type, zone_id) per sensor column
+        self._sensor_info: List[Tuple[str, str, Optional[str]]] = []
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def column(self, sensor_id: str, sensor: BaseSensor) -> int:
+        """Column of a sensor, registering its attributes the first time it is seen."""
+        col = self._columns.get(sensor_id)
+        if col is None:
+            col = len(self.sensor_ids)
+            if col == self._values.shape[1]:
+                self._grow_columns()
+            self._columns[sensor_id] = col
+            self.sensor_ids.append(sensor_id)
+            self._sensor_info.append((sensor.unit, sensor.sensor_type, getattr(sensor, 'zone_id', None)))
+        return col
+    
+    def _grow_columns(self) -> None:
+        """Double the number of sensor columns."""
+        for name in ("_values", "_qualities"):
+            column = getattr(self, name)
+            grown = np.full((self.capacity, 2 * column.shape[1]), np.nan)
+            grown[:, :column.shape[1]] = column
+            setattr(self, name, grown)
+    
+    def append(
+        self,
+        ts_us: int,
+        columns: Sequence[int],
+        values: Sequence[float],
+        qualities: Sequence[float],
+        errors: Dict[int, str],
+        summary: Dict[str, Any],
+    ) -> None:
+        """Store one tick, overwriting the oldest once the history is full."""
+        slot = self._head
+        if self._count == self.capacity:
+            # Retire the oldest tick before overwriting it, so readers never pick up a half-written row
+            self._count -= 1
+        columns = np.asarray(columns, dtype=np.intp)
+        self._stamps[slot] = ts_us
+        self._values[slot] = np.nan
+        self._values[slot, columns] = values
+        self._qualities[slot] = np.nan
+        self._qualities[slot, columns] = qualities
+        self._summaries[slot] = [summary[field] for field in self._SUMMARY_FIELDS]
+        if errors:
+            self._errors[slot] = errors
+        else:
+            self._errors.pop(slot, None)
+        # Publish the row only once it is complete
+        self._head = (slot + 1) % self.capacity
+        self._count += 1
+    
+    def _slots(self) -> np.ndarray:
+        """Stored slots in chronological order."""
+        return (self._head - self._count + np.arange(self._count)) % self.capacity
+    
+    def slots_since(self, cutoff_us: int) -> np.ndarray:
+        """Chronological slots of the ticks stamped at or after `cutoff_us`."""
+        slots = self._slots()
+        return slots[np.searchsorted(self._stamps[slots], cutoff_us, side="left"):]
+    
+    def arrays(self, slots: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Copies of (epoch-us stamps, (ticks, sensors) values, sensor ids) for the given slots."""
+        n = len(self.sensor_ids)
+        return self._stamps[slots], self._values[slots, :n], self.sensor_ids[:n]
+    
+    def snapshots(self, slots: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the given slots as reading snapshot dicts.
+        
+        The rows are copied when this is called, so later appends do not leak in.
+        """
+        n = len(self.sensor_ids)
+        return self._iter_snapshots(
+            self._stamps[slots], self._values[slots, :n], self._qualities[slots, :n],
+            self._summaries[slots], [self._errors.get(slot) for slot in slots.tolist()],
+            self.sensor_ids[:n], self._sensor_info[:n],
+        )
+    
+    def _iter_snapshots(self, stamps, values, qualities, summaries, errors, sensor_ids, sensor_info):
+        """Build snapshot dicts from copied rows."""
+        for k, ts_us in enumerate(stamps.tolist()):
+            present = np.flatnonzero(~np.isnan(values[k]))
+            readings = {}
+            for col, value, quality in zip(present.tolist(), values[k, present].tolist(),
+                                           qualities[k, present].tolist()):
+                unit, sensor_type, zone_id = sensor_info[col]
+                readings[sensor_ids[col]] = {
+                    "value": value,
+                    "unit": unit,
+                    "quality": quality,
+                    "sensor_type": sensor_type,
+                    "zone_id": zone_id
+                }
+            for col, message in (errors[k] or {}).items():
+                readings[sensor_ids[col]] = {"error": message}
+            
+            yield {
+                "ts_us": ts_us,
+                "readings": readings,
+                "building_summary": {
+                    field: int(total) if field in self._INT_SUMMARY_FIELDS else total
+                    for field, total in zip(self._SUMMARY_FIELDS, summaries[k].tolist())
+                }
+            }
+    
+    def clear(self) -> None:
+        """Remove all stored ticks; sensor columns stay registered."""
+        self._head = 0
+        self._count = 0
+        self._errors.clear()
+
+
+@dataclass(**DATACLASS_SLOTS)
 class MonitoringConfig:
     """Configuration for the monitoring system."""
     sampling_interval: int = 60  # seconds between readings
     anomaly_check_interval: int = 300  # seconds between anomaly checks
     auto_start: bool = True
+    use_asyncio: bool = False  # run the loop on an event loop, reading sensors on a worker thread
     save_history: bool = True
     max_history_size: int = 10000
     enable_alerts: bool = True
@@ -55,21 +262,40 @@ class MonitoringSystem:
         self.building = building
         self.config = config or MonitoringConfig()
         self.anomaly_detector = AnomalyDetector()
+        self._rng = np.random.default_rng()
         
         # Monitoring state
         self.is_running = False
         self.monitoring_thread: Optional[Thread] = None
         self.stop_event = Event()
-        
-        # Data storage
-        self.reading_history: List[Dict[str, Any]] = []
-        self.alert_history: List[Dict[str, Any]] = []
+        # Background event loop hosting the asyncio monitoring loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[Thread] = None
+        self._monitoring_future: Optional[Future] = None
+        self._async_stop: Optional[asyncio.Event] = None
+        
+        # Data storage (bounded; the oldest entries are evicted once full). The monitoring
+        # thread is the only producer; every other reader works on a snapshot (copied rows,
+        # or a list() of the alert deque, which CPython copies atomically under the GIL)
+        # rather than iterating the live containers while they are appended to
+        self.reading_history = ReadingHistory(self.config.max_history_size)
+        self.alert_history: Deque[Dict[str, Any]] = deque(maxlen=self.config.max_history_size)
+        # Epoch-microsecond stamps kept in step with the alerts, for bisecting time windows
+        self._alert_stamps: Deque[int] = deque(maxlen=self.config.max_history_size)
+        # Alert stamps split by severity, pruned lazily to the dashboard's 24h window
+        self._alerts_by_severity: Dict[str, Deque[int]] = {
+            severity.value: deque() for severity in SeverityLevel
+        }
         
         # Performance metrics
         self.start_time: Optional[datetime] = None
         self.total_readings = 0
         self.total_anomalies = 0
         
+        # Building state summary memoized per sampling tick
+        self._last_reading_ts: Optional[datetime] = None
+        self._state_summary_cache: Optional[Tuple[datetime, Dict[str, Any]]] = None
+        
         logger.info(f"Initialized monitoring system for building: {building.info.name}")
     
     def start_monitoring(self) -> None:
@@ -83,8 +309,14 @@ class MonitoringSystem:
         self.stop_event.clear()
         
         if self.config.auto_start:
-            self.monitoring_thread = Thread(target=self._monitoring_loop, daemon=True)
-            self.monitoring_thread.start()
+            if self.config.use_asyncio:
+                self._start_event_loop()
+                self._monitoring_future = asyncio.run_coroutine_threadsafe(
+                    self._async_monitoring_loop(), self._loop
+                )
+            else:
+                self.monitoring_thread = Thread(target=self._monitoring_loop, daemon=True)
+                self.monitoring_thread.start()
             
         logger.info("Started monitoring system")
     
@@ -97,83 +329,186 @@ class MonitoringSystem:
         self.is_running = False
         self.stop_event.set()
         
+        if self._monitoring_future is not None:
+            self._loop.call_soon_threadsafe(self._wake_async_loop)
+            try:
+                self._monitoring_future.result(timeout=5)
+            except Exception as e:
+                logger.warning(f"Monitoring loop did not stop cleanly: {e}")
+            self._monitoring_future = None
+            self._stop_event_loop()
+        
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5)
         
         logger.info("Stopped monitoring system")
     
+    def _start_event_loop(self) -> None:
+        """Start a fresh event loop on a daemon thread."""
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+    
+    def _stop_event_loop(self) -> None:
+        """Stop the background event loop and close it once its thread has exited."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=5)
+        if not self._loop.is_running():
+            self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+    
+    def _wake_async_loop(self) -> None:
+        """Signal the asyncio monitoring loop to stop; runs on the event loop thread."""
+        if self._async_stop is not None:
+            self._async_stop.set()
+    
+    async def _wait_async_stop(self, timeout: float) -> None:
+        """Sleep up to `timeout` seconds, returning early if a stop is requested."""
+        try:
+            await asyncio.wait_for(self._async_stop.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
     def _monitoring_loop(self) -> None:
         """Main monitoring loop running in a separate thread."""
         logger.info("Starting monitoring loop")
         
-        last_anomaly_check = datetime.now()
+        # Deadlines on the monotonic clock, so pacing ignores wall-clock steps and
+        # sampling time does not accumulate into the interval
+        next_sample = time.monotonic()
+        next_anomaly_check = next_sample + self.config.anomaly_check_interval
         
         while self.is_running and not self.stop_event.is_set():
             try:
-                # Take readings from all sensors
-                self._collect_sensor_readings()
+                # Take readings from all sensors, stamped with one tick time
+                tick_time = datetime.now()
+                self._collect_sensor_readings(tick_time)
                 
                 # Check for anomalies periodically
-                current_time = datetime.now()
-                if (current_time - last_anomaly_check).total_seconds() >= self.config.anomaly_check_interval:
-                    self._perform_anomaly_detection()
-                    last_anomaly_check = current_time
+                now = time.monotonic()
+                if now >= next_anomaly_check:
+                    self._perform_anomaly_detection(tick_time)
+                    next_anomaly_check = now + self.config.anomaly_check_interval
                 
-                # Wait for next sampling interval
-                self.stop_event.wait(self.config.sampling_interval)
+                # Wait for next sampling deadline; if a tick overran, skip the missed ones
+                next_sample = max(next_sample + self.config.sampling_interval, time.monotonic())
+                self.stop_event.wait(next_sample - time.monotonic())
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
                 time.sleep(5)  # Wait before retrying
+                next_sample = time.monotonic()
     
-    def _collect_sensor_readings(self) -> None:
-        """Collect readings from all sensors in the building."""
-        timestamp = datetime.now()
-        readings = {}
+    async def _async_monitoring_loop(self) -> None:
+        """Main monitoring loop running as a task on the background event loop."""
+        logger.info("Starting monitoring loop")
+        self._async_stop = asyncio.Event()
         
-        for sensor_id, sensor in self.building.sensors.items():
+        next_sample = time.monotonic()
+        next_anomaly_check = next_sample + self.config.anomaly_check_interval
+        
+        while self.is_running and not self._async_stop.is_set():
             try:
-                if sensor.is_active():
-                    reading = sensor.take_reading()
-                    readings[sensor_id] = {
-                        "value": reading.value,
-                        "unit": reading.unit,
-                        "quality": reading.quality,
-                        "sensor_type": sensor.sensor_type,
-                        "zone_id": getattr(sensor, 'zone_id', None)
-                    }
-                    
-                    # Add to anomaly detector
-                    self.anomaly_detector.add_sensor_reading(
-                        sensor_id=sensor_id,
-                        value=reading.value,
-                        timestamp=timestamp,
-                        sensor_type=sensor.sensor_type,
-                        zone_id=getattr(sensor, 'zone_id', None),
-                        metadata=reading.metadata
-                    )
-                    
-                    self.total_readings += 1
-                    
+                # The tick's batched sensor read runs on a worker thread; the rest stays on the loop thread
+                tick_time = datetime.now()
+                await self._collect_sensor_readings_async(tick_time)
+                
+                now = time.monotonic()
+                if now >= next_anomaly_check:
+                    self._perform_anomaly_detection(tick_time)
+                    next_anomaly_check = now + self.config.anomaly_check_interval
+                
+                next_sample = max(next_sample + self.config.sampling_interval, time.monotonic())
+                await self._wait_async_stop(next_sample - time.monotonic())
+                
+            except Exception as e:
+                logger.error(f"Error in monitoring loop: {e}")
+                await self._wait_async_stop(5)  # Wait before retrying
+                next_sample = time.monotonic()
+    
+    def _collect_sensor_readings(
+        self, now: Optional[datetime] = None
+    ) -> Tuple[List[Tuple[str, BaseSensor]], List[Union[SensorReading, Exception]]]:
+        """Collect readings from all sensors in the building, stamped with one tick time."""
+        timestamp = now or datetime.now()
+        sensors, fail_draws, noise_draws = self._prepare_sensor_reads()
+        results = take_readings([sensor for _, sensor in sensors], fail_draws, noise_draws, timestamp)
+        self._record_sensor_readings(timestamp, sensors, results)
+        return sensors, results
+    
+    async def _collect_sensor_readings_async(self, now: Optional[datetime] = None) -> None:
+        """Collect readings from all sensors, running the batched read in one worker thread."""
+        timestamp = now or datetime.now()
+        sensors, fail_draws, noise_draws = self._prepare_sensor_reads()
+        # A single thread keeps sensor and building-cache updates serialized, as in the sync path
+        results = await asyncio.to_thread(
+            take_readings, [sensor for _, sensor in sensors], fail_draws, noise_draws, timestamp
+        )
+        self._record_sensor_readings(timestamp, sensors, results)
+    
+    def _prepare_sensor_reads(self) -> Tuple[List[Tuple[str, BaseSensor]], np.ndarray, np.ndarray]:
+        """Active sensors for this tick with their failure and noise samples, drawn in two batches."""
+        sensors = [
+            (sensor_id, sensor)
+            for sensor_id, sensor in list(self.building.sensors.items())
+            if sensor.is_active()
+        ]
+        fail_draws = self._rng.random(len(sensors))
+        noise_draws = self._rng.standard_normal(len(sensors))
+        return sensors, fail_draws, noise_draws
+    
+    def _record_sensor_readings(
+        self,
+        timestamp: datetime,
+        sensors: List[Tuple[str, BaseSensor]],
+        results: List[Union[SensorReading, Exception]],
+    ) -> None:
+        """Feed one tick's readings to the anomaly detector and the reading history."""
+        save_history = self.config.save_history
+        history = self.reading_history
+        columns: List[int] = []
+        values: List[float] = []
+        qualities: List[float] = []
+        errors: Dict[int, str] = {}
+        
+        for (sensor_id, sensor), reading in zip(sensors, results):
+            try:
+                if isinstance(reading, Exception):
+                    raise reading
+                
+                if save_history:
+                    columns.append(history.column(sensor_id, sensor))
+                    values.append(reading.value)
+                    qualities.append(reading.quality)
+                
+                # Add to anomaly detector
+                self.anomaly_detector.add_sensor_reading(
+                    sensor_id=sensor_id,
+                    value=reading.value,
+                    timestamp=timestamp,
+                    sensor_type=sensor.sensor_type,
+                    zone_id=getattr(sensor, 'zone_id', None),
+                    metadata=reading.metadata
+                )
+                
+                self.total_readings += 1
+                
             except Exception as e:
                 logger.warning(f"Failed to read sensor {sensor_id}: {e}")
-                readings[sensor_id] = {"error": str(e)}
+                if save_history:
+                    errors[history.column(sensor_id, sensor)] = str(e)
+        
+        self._last_reading_ts = timestamp
         
         # Store reading snapshot
-        if self.config.save_history:
-            reading_snapshot = {
-                "timestamp": timestamp.isoformat(),
-                "readings": readings,
-                "building_summary": self._get_building_state_summary()
-            }
-            
-            self.reading_history.append(reading_snapshot)
-            
-            # Limit history size
-            if len(self.reading_history) > self.config.max_history_size:
-                self.reading_history.pop(0)
+        if save_history:
+            history.append(
+                _epoch_us(timestamp), columns, values, qualities, errors,
+                self._get_building_state_summary()
+            )
     
-    def _perform_anomaly_detection(self) -> None:
+    def _perform_anomaly_detection(self, now: Optional[datetime] = None) -> None:
         """Perform anomaly detection and handle alerts."""
         logger.debug("Performing anomaly detection")
         
@@ -189,51 +524,78 @@ class MonitoringSystem:
             
             # Process alerts
             if self.config.enable_alerts:
-                self._process_alerts(anomalies)
+                self._process_alerts(anomalies, now)
     
-    def _process_alerts(self, anomalies: List[Anomaly]) -> None:
-        """Process and store alerts for detected anomalies."""
-        severity_order = {"low": 0, "medium": 1, "high": 2, "critical": 3}
-        threshold_level = severity_order.get(self.config.alert_threshold, 1)
-        
-        for anomaly in anomalies:
-            anomaly_level = severity_order.get(anomaly.severity.value, 0)
+    def _process_alerts(self, anomalies: AnomalyBuffer, now: Optional[datetime] = None) -> None:
+        """Process and store alerts for detected anomalies, stamped with the tick time."""
+        ts_us = _epoch_us(now or datetime.now())
+        try:
+            threshold = SeverityLevel(self.config.alert_threshold)
+        except ValueError:
+            threshold = SeverityLevel.MEDIUM
+        
+        # Severity codes are ordered, so one vectorized compare selects the alerts
+        for index in anomalies.at_least(threshold).tolist():
+            anomaly = anomalies[index]
+            alert = {
+                "ts_us": ts_us,
+                "sensor_id": anomaly.sensor_id,
+                "anomaly_type": anomaly.anomaly_type.value,
+                "severity": anomaly.severity.value,
+                "confidence": anomaly.confidence,
+                "description": anomaly.description,
+                "recommendations": anomaly.recommendations,
+                "value": anomaly.value,
+                "expected_range": anomaly.expected_range
+            }
             
-            if anomaly_level >= threshold_level:
-                alert = {
-                    "timestamp": datetime.now().isoformat(),
-                    "sensor_id": anomaly.sensor_id,
-                    "anomaly_type": anomaly.anomaly_type.value,
-                    "severity": anomaly.severity.value,
-                    "confidence": anomaly.confidence,
-                    "description": anomaly.description,
-                    "recommendations": anomaly.recommendations,
-                    "value": anomaly.value,
-                    "expected_range": anomaly.expected_range
-                }
-                
-                self.alert_history.append(alert)
-                
-                # Log alert
-                logger.warning(
-                    f"ALERT [{anomaly.severity.value.upper()}] "
-                    f"Sensor {anomaly.sensor_id}: {anomaly.description}"
-                )
+            if len(self.alert_history) == self.alert_history.maxlen:
+                # The evicted alert is also the oldest of its severity, unless
+                # the 24h pruning already dropped it
+                evicted = self.alert_history[0]
+                by_severity = self._alerts_by_severity[evicted["severity"]]
+                if by_severity and by_severity[0] == evicted["ts_us"]:
+                    by_severity.popleft()
+            
+            self.alert_history.append(alert)
+            self._alert_stamps.append(ts_us)
+            self._alerts_by_severity[anomaly.severity.value].append(ts_us)
+            
+            # Log alert
+            logger.warning(
+                f"ALERT [{anomaly.severity.value.upper()}] "
+                f"Sensor {anomaly.sensor_id}: {anomaly.description}"
+            )
+    
+    def _count_alerts_since(self, severity: str, cutoff_us: int) -> int:
+        """Count alerts of one severity stamped at or after the cutoff."""
+        by_severity = self._alerts_by_severity[severity]
+        while by_severity and by_severity[0] < cutoff_us:
+            by_severity.popleft()
+        return len(by_severity)
     
     def _get_building_state_summary(self) -> Dict[str, Any]:
-        """Get current building state summary."""
-        return {
+        """Get current building state summary, reusing it until the next sampling tick."""
+        cached = self._state_summary_cache
+        if cached is not None and cached[0] == self._last_reading_ts:
+            return cached[1]
+        
+        summary = {
             "total_occupancy": self.building.get_total_occupancy(),
             "total_energy_consumption": self.building.get_total_energy_consumption(),
-            "active_sensors": len([s for s in self.building.sensors.values() if s.is_active()]),
+            "active_sensors": self.building.get_active_sensor_count(),
             "total_sensors": len(self.building.sensors)
         }
+        if self._last_reading_ts is not None:
+            self._state_summary_cache = (self._last_reading_ts, summary)
+        return summary
     
-    def get_current_status(self) -> Dict[str, Any]:
-        """Get current monitoring system status."""
+    def get_current_status(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get current monitoring system status as of `now` (default: the current time)."""
+        now = now or datetime.now()
         runtime = None
         if self.start_time:
-            runtime = (datetime.now() - self.start_time).total_seconds()
+            runtime = (now - self.start_time).total_seconds()
         
         return {
             "is_running": self.is_running,
@@ -244,29 +606,35 @@ class MonitoringSystem:
             "building_name": self.building.info.name,
             "sensor_count": len(self.building.sensors),
             "zone_count": len(self.building.zones),
-            "recent_alerts": len([
-                a for a in self.alert_history 
-                if datetime.fromisoformat(a["timestamp"]) > datetime.now() - timedelta(hours=24)
-            ])
+            "recent_alerts": len(self._alert_stamps) - bisect_right(
+                self._alert_stamps, _epoch_us(now - timedelta(hours=24))
+            )
         }
     
     def get_recent_readings(self, hours: int = 1) -> List[Dict[str, Any]]:
-        """Get recent readings within specified hours."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        """Get recent reading snapshots within specified hours."""
+        cutoff_us = _epoch_us(datetime.now() - timedelta(hours=hours))
+        return list(self.reading_history.snapshots(self.reading_history.slots_since(cutoff_us)))
+    
+    def get_recent_reading_arrays(self, hours: int = 1) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Get recent readings as arrays, without building snapshot dicts.
         
-        return [
-            reading for reading in self.reading_history
-            if datetime.fromisoformat(reading["timestamp"]) >= cutoff_time
-        ]
+        Returns:
+            (epoch-microsecond stamps, (ticks, sensors) values with NaN for missing
+            readings, sensor ids labelling the value columns)
+        """
+        cutoff_us = _epoch_us(datetime.now() - timedelta(hours=hours))
+        return self.reading_history.arrays(self.reading_history.slots_since(cutoff_us))
     
     def get_recent_alerts(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get recent alerts within specified hours."""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        
-        return [
-            alert for alert in self.alert_history
-            if datetime.fromisoformat(alert["timestamp"]) >= cutoff_time
-        ]
+        return _entries_since(self.snapshot_alerts(), cutoff_time)
+    
+    def snapshot_alerts(self) -> List[Dict[str, Any]]:
+        """Copy of the alert history, safe to use while the monitoring thread keeps appending."""
+        return list(self.alert_history)
     
     def get_sensor_statistics(self, sensor_id: str, hours: int = 24) -> Optional[Dict[str, Any]]:
         """Get statistics for a specific sensor."""
@@ -276,38 +644,37 @@ class MonitoringSystem:
         
         stats = sensor.get_statistics(hours)
         
-        # Add anomaly information
-        recent_anomalies = [
-            a for a in self.anomaly_detector.detected_anomalies
-            if a.sensor_id == sensor_id and 
-               a.timestamp > datetime.now() - timedelta(hours=hours)
-        ]
+        # Add anomaly information, filtering on the int64 timestamp column
+        anomalies = self.anomaly_detector.detected_anomalies
+        recent_idx = anomalies.since(datetime.now() - timedelta(hours=hours), sensor_id)
         
         stats.update({
             "sensor_info": sensor.get_sensor_info(),
-            "recent_anomalies": len(recent_anomalies),
-            "last_anomaly": recent_anomalies[-1].timestamp.isoformat() if recent_anomalies else None
+            "recent_anomalies": len(recent_idx),
+            "last_anomaly": anomalies[int(recent_idx[-1])].timestamp.isoformat() if len(recent_idx) else None
         })
         
         return stats
     
     def export_data(self, filepath: str, hours: Optional[int] = None) -> None:
-        """Export monitoring data to a JSON file."""
+        """
+        Export monitoring data to a JSON file.
+        
+        Readings, alerts and sensor summaries are streamed to disk one entry at a
+        time, so memory use stays flat regardless of history size.
+        """
+        # Snapshot the histories (copied rows / references) so the monitoring thread can keep appending
         if hours:
             cutoff_time = datetime.now() - timedelta(hours=hours)
-            readings = [
-                r for r in self.reading_history
-                if datetime.fromisoformat(r["timestamp"]) >= cutoff_time
-            ]
-            alerts = [
-                a for a in self.alert_history
-                if datetime.fromisoformat(a["timestamp"]) >= cutoff_time
-            ]
+            readings = self.reading_history.snapshots(
+                self.reading_history.slots_since(_epoch_us(cutoff_time))
+            )
+            alerts = _entries_since(self.snapshot_alerts(), cutoff_time)
         else:
-            readings = self.reading_history
-            alerts = self.alert_history
+            readings = self.reading_history.snapshots(self.reading_history.slots_since(0))
+            alerts = self.snapshot_alerts()
         
-        export_data = {
+        header = {
             "export_timestamp": datetime.now().isoformat(),
             "building_info": {
                 "name": self.building.info.name,
@@ -316,16 +683,24 @@ class MonitoringSystem:
                 "floors": self.building.info.floors
             },
             "monitoring_status": self.get_current_status(),
-            "readings": readings,
-            "alerts": alerts,
-            "sensor_summary": {
-                sensor_id: sensor.get_sensor_info()
-                for sensor_id, sensor in self.building.sensors.items()
-            }
         }
         
         with open(filepath, 'w') as f:
-            json.dump(export_data, f, indent=2)
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {_json_dumps(key)}: {_json_dumps(value)},\n")
+            
+            # Stored entries carry integer stamps; format them only as each row is written
+            f.write('  "readings": ')
+            _write_json_array(f, (_with_iso_timestamp(r) for r in readings))
+            f.write(',\n  "alerts": ')
+            _write_json_array(f, (_with_iso_timestamp(a) for a in alerts))
+            f.write(',\n  "sensor_summary": ')
+            _write_json_object(f, (
+                (sensor_id, sensor.get_sensor_info())
+                for sensor_id, sensor in list(self.building.sensors.items())
+            ))
+            f.write("\n}\n")
         
         logger.info(f"Exported monitoring data to {filepath}")
     
@@ -333,65 +708,101 @@ class MonitoringSystem:
         """Clear all stored history data."""
         self.reading_history.clear()
         self.alert_history.clear()
+        self._alert_stamps.clear()
+        for by_severity in self._alerts_by_severity.values():
+            by_severity.clear()
         self.anomaly_detector.detected_anomalies.clear()
         logger.info("Cleared all history data")
     
     def add_sensor_to_building(self, sensor: BaseSensor, zone_id: Optional[str] = None) -> None:
         """Add a new sensor to the building during runtime."""
         self.building.add_sensor(sensor, zone_id)
+        self._state_summary_cache = None
         logger.info(f"Added sensor {sensor.id} to monitoring system")
     
     def remove_sensor_from_building(self, sensor_id: str) -> bool:
         """Remove a sensor from monitoring."""
-        if sensor_id in self.building.sensors:
-            del self.building.sensors[sensor_id]
+        if self.building.remove_sensor(sensor_id):
+            self._state_summary_cache = None
             logger.info(f"Removed sensor {sensor_id} from monitoring system")
             return True
         return False
     
     def simulate_step(self) -> None:
         """Manually trigger one monitoring step (useful for testing)."""
+        now = datetime.now()
         if not self.is_running:
-            self.start_time = datetime.now()
+            self.start_time = now
         
-        self._collect_sensor_readings()
-        self._perform_anomaly_detection()
+        self._collect_sensor_readings(now)
+        self._perform_anomaly_detection(now)
+    
+    def simulate_steps(self, n: int) -> Tuple[np.ndarray, List[str]]:
+        """
+        Manually trigger `n` monitoring steps back to back (useful for testing).
+        
+        Returns:
+            ((n, sensors) reading values with NaN for inactive or failed sensors,
+            sensor ids labelling the value columns)
+        """
+        sensor_ids = list(self.building.sensors)
+        columns = {sensor_id: col for col, sensor_id in enumerate(sensor_ids)}
+        values = np.full((n, len(sensor_ids)), np.nan)
+        
+        for step in range(n):
+            now = datetime.now()
+            if not self.is_running:
+                self.start_time = now
+            
+            sensors, results = self._collect_sensor_readings(now)
+            row = values[step]
+            for (sensor_id, _), reading in zip(sensors, results):
+                col = columns.get(sensor_id)
+                if col is not None and not isinstance(reading, Exception):
+                    row[col] = reading.value
+            self._perform_anomaly_detection(now)
+        
+        return values, sensor_ids
     
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get comprehensive data for dashboard display."""
         current_time = datetime.now()
         
-        # Get recent data
-        recent_readings = self.get_recent_readings(hours=1)
-        recent_alerts = self.get_recent_alerts(hours=24)
+        # Count the last 24h of alerts from the stamps; only the newest few are copied
+        cutoff_us = _epoch_us(current_time - timedelta(hours=24))
+        alerts_24h = len(self._alert_stamps) - bisect_left(self._alert_stamps, cutoff_us)
+        # Indexing the deque ends, unlike iterating it, cannot fail if an alert is appended meanwhile
+        n_alerts = len(self.alert_history)
+        recent_alerts = [
+            self.alert_history[k] for k in range(n_alerts - min(alerts_24h, 5, n_alerts), n_alerts)
+        ]
         
-        # Calculate metrics
-        energy_consumption = self.building.get_total_energy_consumption()
-        occupancy = self.building.get_total_occupancy()
+        # Calculate metrics (shared with the latest reading snapshot)
+        state = self._get_building_state_summary()
         
         # Sensor health
-        active_sensors = [s for s in self.building.sensors.values() if s.is_active()]
-        total_sensors = len(self.building.sensors)
+        active_sensors = state["active_sensors"]
+        total_sensors = state["total_sensors"]
         
         return {
             "timestamp": current_time.isoformat(),
             "building": {
                 "name": self.building.info.name,
-                "occupancy": occupancy,
-                "energy_consumption": energy_consumption,
+                "occupancy": state["total_occupancy"],
+                "energy_consumption": state["total_energy_consumption"],
                 "zones": len(self.building.zones),
             },
             "sensors": {
                 "total": total_sensors,
-                "active": len(active_sensors),
-                "health_percentage": (len(active_sensors) / total_sensors * 100) if total_sensors > 0 else 0
+                "active": active_sensors,
+                "health_percentage": (active_sensors / total_sensors * 100) if total_sensors > 0 else 0
             },
             "alerts": {
-                "total_24h": len(recent_alerts),
-                "critical": len([a for a in recent_alerts if a["severity"] == "critical"]),
-                "high": len([a for a in recent_alerts if a["severity"] == "high"]),
-                "recent": recent_alerts[:5]  # Last 5 alerts
+                "total_24h": alerts_24h,
+                "critical": self._count_alerts_since("critical", cutoff_us),
+                "high": self._count_alerts_since("high", cutoff_us),
+                "recent": recent_alerts  # Last 5 alerts
             },
-            "monitoring": self.get_current_status(),
+            "monitoring": self.get_current_status(current_time),
             "anomaly_summary": self.anomaly_detector.get_anomaly_summary(hours=24)
         }
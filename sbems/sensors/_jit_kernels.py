@@ -0,0 +1,63 @@
+"""
+Numeric kernels behind the sensor simulators, compiled with Numba when it is available.
+"""
+
+import numpy as np
+
+from .._compat import njit, prange, vectorize
+
+
+# Solar cycle factors, computed once for every hour of day and day of year (1-366)
+# rather than per reading; the kernels index them as compile-time constants
+_HOURS = np.arange(24)
+_DAILY_SIN = np.sin(2 * np.pi * (_HOURS - 14) / 24)  # Peak at 2 PM
+_SEASONAL_SIN = np.sin(2 * np.pi * (np.arange(367) - 80) / 365)  # Peak in summer
+# Natural light in lux, peaking at noon during daytime (6-18)
+_DAYLIGHT = np.where(
+    (_HOURS >= 6) & (_HOURS <= 18), 800.0 * (np.cos(2 * np.pi * (_HOURS - 12) / 12) + 1) / 2, 0.0
+)
+
+
+@njit(fastmath=True, cache=True)
+def temp_kernel(hour, doy, target, daily, seasonal, occ, noise):
+    """Temperature from the daily (peak at 2 PM) and seasonal cycles plus sampled effects, clipped to 10-35 °C."""
+    daily_variation = daily * _DAILY_SIN[hour]
+    seasonal_variation = seasonal * _SEASONAL_SIN[doy]
+    temperature = target + daily_variation + seasonal_variation + occ + noise
+    return min(max(temperature, 10.0), 35.0)
+
+
+@njit(fastmath=True, cache=True)
+def natural_light_kernel(hour, weather_factor, natural_light_factor):
+    """Natural light in lux for an hour of day, peaking at noon during daytime (6-18)."""
+    return _DAYLIGHT[hour] * weather_factor * natural_light_factor
+
+
+@njit(fastmath=True, cache=True)
+def power_kernel(base_load, capacity, load_pattern, noise):
+    """Power draw between base load and circuit capacity for a load pattern, with ±15% noise."""
+    expected_power = base_load + (capacity - base_load) * load_pattern
+    return min(max(expected_power + 0.15 * expected_power * noise, 0.0), capacity)
+
+
+@njit(fastmath=True, cache=True)
+def people_count_kernel(max_occupancy, occupancy_pattern, noise):
+    """Non-negative people count for an occupancy pattern, with 20% noise, rounded half up."""
+    expected_occupancy = max_occupancy * occupancy_pattern
+    actual_occupancy = expected_occupancy + 0.2 * expected_occupancy * noise
+    return int(actual_occupancy + 0.5) if actual_occupancy > 0 else 0
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def temp_kernel_batch(hours, doys, target, daily, seasonal, occ, noise):
+    """temp_kernel over arrays of hours, days of year and sampled effects."""
+    out = np.empty(hours.size)
+    for k in prange(hours.size):
+        out[k] = temp_kernel(hours[k], doys[k], target, daily, seasonal, occ[k], noise[k])
+    return out
+
+
+@vectorize(["float64(int64, float64, float64)"], fastmath=True, cache=True)
+def natural_light_ufunc(hour, weather_factor, natural_light_factor):
+    """natural_light_kernel as a ufunc, broadcasting over hours, weather factors and light factors."""
+    return _DAYLIGHT[hour] * weather_factor * natural_light_factor
@@ -3,13 +3,21 @@ Base sensor class for all building sensors.
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass, field
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Deque, Dict, Any, List, Sequence, Tuple, Optional, Union
+from dataclasses import dataclass
 from enum import Enum
+import time
 import uuid
 import numpy as np
 
+from .._compat import DATACLASS_SLOTS, njit
+
+# Random samples drawn per refill of a sensor's sample buffers
+_RANDOM_BUFFER_SIZE = 1024
+
 
 class SensorStatus(Enum):
     """Sensor operational status."""
@@ -20,14 +28,77 @@ class SensorStatus(Enum):
     CALIBRATING = "calibrating"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SensorReading:
     """Represents a single sensor reading."""
     timestamp: datetime
     value: float
     unit: str
     quality: float = 1.0  # 0.0 to 1.0, where 1.0 is perfect quality
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None  # Extra per-reading data; sensor attributes live on the sensor
+
+
+def clip_scalar(x: float, low: float, high: float) -> float:
+    """Clamp a Python scalar to [low, high] without np.clip's array dispatch."""
+    return low if x < low else high if x > high else x
+
+
+@njit(cache=True, fastmath=True)
+def _tick_numeric(values_out, noise, noise_scales, drift_rates, base_values, offsets, ages):
+    """Noise/drift/calibration-adjusted values for a batch of sensors."""
+    for k in range(values_out.size):
+        base = base_values[k]
+        values_out[k] = (base + noise[k] * noise_scales[k] * abs(base)
+                         + drift_rates[k] * ages[k] + offsets[k])
+
+
+def take_readings(
+    sensors: Sequence["BaseSensor"],
+    fail_u: Sequence[float],
+    noise_z: Sequence[float],
+    now: Optional[datetime] = None,
+) -> List[Union[SensorReading, Exception]]:
+    """
+    Take one reading from each sensor, applying the measurement model in one pass.
+    
+    Equivalent to calling take_reading(fail_u[k], noise_z[k], now) on every sensor,
+    except that errors are returned in the sensor's slot instead of raised.
+    """
+    if now is None:
+        now = datetime.now()
+    n = len(sensors)
+    results: List[Union[SensorReading, Exception, None]] = [None] * n
+    # Failure is decided before reading, so failing sensors leave their simulators untouched
+    failed = np.asarray(fail_u, dtype=np.float64) < np.fromiter(
+        (s.failure_probability for s in sensors), np.float64, n)
+    base_values = np.zeros(n)
+    for k, (sensor, has_failed) in enumerate(zip(sensors, failed.tolist())):
+        try:
+            if not sensor.is_active():
+                raise RuntimeError(f"Sensor {sensor.id} is not active (status: {sensor.status})")
+            if has_failed:
+                results[k] = sensor._mark_failed()
+            else:
+                base_values[k] = sensor._read_sensor_value()
+        except Exception as e:
+            results[k] = e
+    
+    now_mono = time.monotonic()
+    values = np.empty(n)
+    _tick_numeric(
+        values,
+        np.asarray(noise_z, dtype=np.float64),
+        np.fromiter((s._noise_scale for s in sensors), np.float64, n),
+        np.fromiter((s._drift_rate for s in sensors), np.float64, n),
+        base_values,
+        np.fromiter((s._calibration_offset for s in sensors), np.float64, n),
+        now_mono - np.fromiter((s._created_mono for s in sensors), np.float64, n),
+    )
+    
+    for k, (sensor, value) in enumerate(zip(sensors, values.tolist())):
+        if results[k] is None:
+            results[k] = sensor._store_reading(value, now)
+    return results
 
 
 class BaseSensor(ABC):
@@ -35,6 +106,18 @@ class BaseSensor(ABC):
     Abstract base class for all building sensors.
     """
     
+    # Instance attributes live in slots rather than a per-instance __dict__; subclasses
+    # declare their own additions so large fleets of sensors stay compact
+    __slots__ = (
+        "id", "position", "zone_id", "name", "_status_listener", "_value_listener",
+        "_status", "_calibration_ready_at", "created_at", "_created_mono",
+        "last_reading_time", "_max_history_size", "readings_history",
+        "_values", "_stamps", "_head", "_count",
+        "sampling_rate", "_accuracy", "_noise_scale", "_drift_rate", "_drift_enabled",
+        "failure_probability", "_current_value", "_calibration_offset",
+        "_rng", "_normal_buf", "_normal_idx", "_uniform_buf", "_uniform_idx", "_info_static",
+    )
+    
     def __init__(
         self,
         sensor_id: Optional[str] = None,
@@ -47,11 +130,26 @@ class BaseSensor(ABC):
         self.position = position  # (x, y, z) coordinates
         self.zone_id = zone_id
         self.name = name or f"{self.sensor_type}_{self.id[:8]}"
-        self.status = SensorStatus.ACTIVE
+        # Called with (sensor, is_active) whenever the sensor enters or leaves ACTIVE
+        self._status_listener: Optional[Callable[["BaseSensor", bool], None]] = None
+        # Called with (sensor,) whenever the value reported by get_current_reading changes
+        self._value_listener: Optional[Callable[["BaseSensor"], None]] = None
+        self._status = SensorStatus.ACTIVE
+        # Monotonic time at which a running calibration completes
+        self._calibration_ready_at = 0.0
         self.created_at = datetime.now()
+        # Monotonic twin of created_at, used for the drift term
+        self._created_mono = time.monotonic()
         self.last_reading_time: Optional[datetime] = None
-        self.readings_history: List[SensorReading] = []
-        self.max_history_size = 1000  # Maximum readings to keep in memory
+        self._max_history_size = 1000  # Maximum readings to keep in memory
+        self.readings_history: Deque[SensorReading] = deque(maxlen=self._max_history_size)
+        # Values and epoch-second timestamps parallel to readings_history. Each reading is
+        # written twice, at slot i and i + max_history_size, so the chronological window is
+        # always one contiguous slice of the doubled buffers
+        self._values = np.empty(2 * self._max_history_size, dtype=np.float64)
+        self._stamps = np.empty(2 * self._max_history_size, dtype=np.float64)
+        self._head = 0
+        self._count = 0
         
         # Sensor configuration
         self.sampling_rate = 60  # seconds between readings
@@ -62,6 +160,16 @@ class BaseSensor(ABC):
         # Current values
         self._current_value: Optional[float] = None
         self._calibration_offset = 0.0
+        
+        # Simulation randomness, drawn from the generator in bulk and handed out one at a time
+        self._rng = np.random.default_rng()
+        self._normal_buf: List[float] = []
+        self._normal_idx = 0
+        self._uniform_buf: List[float] = []
+        self._uniform_idx = 0
+        # get_sensor_info identity fields, built on first use. Type, unit and normal range
+        # follow settable sub-type and capacity attributes, so they are read live
+        self._info_static: Optional[Dict[str, Any]] = None
     
     @property
     @abstractmethod
@@ -81,6 +189,63 @@ class BaseSensor(ABC):
         """Return the normal operating range (min, max)."""
         pass
     
+    @property
+    def accuracy(self) -> float:
+        """Sensor accuracy (0.0 to 1.0); a perfect sensor adds no measurement noise."""
+        return self._accuracy
+    
+    @accuracy.setter
+    def accuracy(self, accuracy: float) -> None:
+        self._accuracy = accuracy
+        self._noise_scale = (1.0 - accuracy) * 0.1
+    
+    @property
+    def drift_rate(self) -> float:
+        """Drift added per second since the sensor was created."""
+        return self._drift_rate
+    
+    @drift_rate.setter
+    def drift_rate(self, drift_rate: float) -> None:
+        self._drift_rate = drift_rate
+        self._drift_enabled = drift_rate != 0.0
+    
+    @property
+    def max_history_size(self) -> int:
+        """Maximum number of readings kept in memory."""
+        return self._max_history_size
+    
+    @max_history_size.setter
+    def max_history_size(self, size: int) -> None:
+        # Reallocate the history deque and the value/timestamp rings together, keeping the
+        # most recent readings that still fit
+        if size < 1:
+            raise ValueError("max_history_size must be at least 1")
+        keep = min(self._count, size)
+        values, stamps = self._window()
+        history = self.readings_history
+        self.readings_history = deque(islice(history, len(history) - keep, None), maxlen=size)
+        self._values = np.empty(2 * size, dtype=np.float64)
+        self._stamps = np.empty(2 * size, dtype=np.float64)
+        for ring, window in ((self._values, values), (self._stamps, stamps)):
+            ring[:keep] = ring[size:size + keep] = window[len(window) - keep:]
+        self._max_history_size = size
+        self._head = keep % size
+        self._count = keep
+    
+    @property
+    def status(self) -> SensorStatus:
+        """Current operational status; a finished calibration returns the sensor to ACTIVE."""
+        if self._status == SensorStatus.CALIBRATING and time.monotonic() >= self._calibration_ready_at:
+            self.status = SensorStatus.ACTIVE
+        return self._status
+    
+    @status.setter
+    def status(self, status: SensorStatus) -> None:
+        was_active = self._status == SensorStatus.ACTIVE
+        self._status = status
+        if self._status_listener is not None and was_active != (status == SensorStatus.ACTIVE):
+            self._status_listener(self, not was_active)
+    
     def is_active(self) -> bool:
         """Check if sensor is active and operational."""
         return self.status == SensorStatus.ACTIVE
@@ -89,108 +254,168 @@ class BaseSensor(ABC):
         """Get the current sensor reading value."""
         if self._current_value is None:
             self._current_value = self._generate_initial_reading()
+            self._notify_value_change()
         return self._current_value + self._calibration_offset
     
-    def take_reading(self) -> SensorReading:
-        """Take a new sensor reading."""
+    def take_reading(
+        self,
+        fail_u: Optional[float] = None,
+        noise_z: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> SensorReading:
+        """
+        Take a new sensor reading.
+        
+        Args:
+            fail_u: Pre-drawn uniform [0, 1) sample for the failure check
+            noise_z: Pre-drawn standard normal sample for the measurement noise
+            now: Timestamp for the reading, defaulting to the current time
+        
+        Callers reading many sensors per tick can draw these in one batch and share
+        one tick timestamp; missing samples come from the sensor's own generator.
+        """
         if not self.is_active():
             raise RuntimeError(f"Sensor {self.id} is not active (status: {self.status})")
         
         # Simulate sensor failure
-        if np.random.random() < self.failure_probability:
-            self.status = SensorStatus.ERROR
-            raise RuntimeError(f"Sensor {self.id} has failed")
+        if fail_u is None:
+            fail_u = self._next_uniform()
+        if fail_u < self.failure_probability:
+            raise self._mark_failed()
         
         # Get the actual reading
         value = self._read_sensor_value()
         
-        # Apply sensor accuracy and drift
-        noise = np.random.normal(0, (1 - self.accuracy) * abs(value) * 0.1)
-        drift = self.drift_rate * (datetime.now() - self.created_at).total_seconds()
-        
-        final_value = value + noise + drift + self._calibration_offset
+        # Apply sensor accuracy and drift, skipping the terms that are zero
+        noise = 0.0
+        if self._noise_scale:
+            if noise_z is None:
+                noise_z = self._next_normal()
+            noise = noise_z * self._noise_scale * abs(value)
+        drift = 0.0
+        if self._drift_enabled:
+            drift = self._drift_rate * (time.monotonic() - self._created_mono)
         
-        # Create reading object
+        return self._store_reading(value + noise + drift + self._calibration_offset, now)
+    
+    def _mark_failed(self) -> RuntimeError:
+        """Put the sensor into ERROR and return the error describing the failure."""
+        self.status = SensorStatus.ERROR
+        return RuntimeError(f"Sensor {self.id} has failed")
+    
+    def _store_reading(self, final_value: float, now: Optional[datetime] = None) -> SensorReading:
+        """Create a reading for a fully adjusted value and store it in the history."""
         reading = SensorReading(
-            timestamp=datetime.now(),
+            timestamp=now or datetime.now(),
             value=final_value,
             unit=self.unit,
             quality=self.accuracy,
-            metadata={
-                "sensor_id": self.id,
-                "sensor_type": self.sensor_type,
-                "zone_id": self.zone_id,
-                "position": self.position,
-            }
         )
         
-        # Store reading
         self.readings_history.append(reading)
+        self._record(final_value, reading.timestamp.timestamp())
         self.last_reading_time = reading.timestamp
         self._current_value = final_value
-        
-        # Limit history size
-        if len(self.readings_history) > self.max_history_size:
-            self.readings_history.pop(0)
+        self._notify_value_change()
         
         return reading
     
+    def _next_normal(self, scale: float = 1.0) -> float:
+        """Next normal sample with mean 0 and standard deviation `scale`."""
+        k = self._normal_idx
+        if k == len(self._normal_buf):
+            self._normal_buf = self._rng.standard_normal(_RANDOM_BUFFER_SIZE, dtype=np.float32).tolist()
+            k = 0
+        self._normal_idx = k + 1
+        return self._normal_buf[k] * scale
+    
+    def _next_uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        """Next uniform sample from [low, high)."""
+        k = self._uniform_idx
+        if k == len(self._uniform_buf):
+            self._uniform_buf = self._rng.random(_RANDOM_BUFFER_SIZE, dtype=np.float32).tolist()
+            k = 0
+        self._uniform_idx = k + 1
+        return low + (high - low) * self._uniform_buf[k]
+    
+    def _notify_value_change(self) -> None:
+        """Tell the value listener, if any, that the current reading changed."""
+        if self._value_listener is not None:
+            self._value_listener(self)
+    
+    def _record(self, value: float, stamp: float) -> None:
+        """Write a reading into the value/timestamp ring buffers."""
+        size = self._max_history_size
+        head = self._head
+        self._values[head] = self._values[head + size] = value
+        self._stamps[head] = self._stamps[head + size] = stamp
+        self._head = (head + 1) % size
+        self._count = min(self._count + 1, size)
+    
+    def _window(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (values, timestamps) of the stored readings as chronological views."""
+        start = (self._head - self._count) % self._max_history_size
+        end = start + self._count
+        return self._values[start:end], self._stamps[start:end]
+    
     @abstractmethod
     def _read_sensor_value(self) -> float:
         """Read the actual sensor value. Must be implemented by subclasses."""
         pass
     
+    def _simulate_default(self, now: datetime) -> float:
+        """Fallback simulator for unknown sub-types: uniform over the normal range."""
+        low, high = self.normal_range
+        return self._next_uniform(low, high)
+    
     def _generate_initial_reading(self) -> float:
         """Generate an initial reading for the sensor."""
         min_val, max_val = self.normal_range
-        return np.random.uniform(min_val, max_val)
+        return self._next_uniform(min_val, max_val)
     
     def get_recent_readings(self, count: int = 10) -> List[SensorReading]:
         """Get the most recent sensor readings."""
-        return self.readings_history[-count:]
+        history = self.readings_history
+        return list(islice(history, max(0, len(history) - count), None))
     
     def get_readings_in_range(self, start_time: datetime, end_time: datetime) -> List[SensorReading]:
         """Get sensor readings within a time range."""
-        return [
-            reading for reading in self.readings_history
-            if start_time <= reading.timestamp <= end_time
-        ]
+        _, stamps = self._window()
+        start = int(np.searchsorted(stamps, start_time.timestamp(), side="left"))
+        end = int(np.searchsorted(stamps, end_time.timestamp(), side="right"))
+        return list(islice(self.readings_history, start, max(start, end)))
     
     def get_statistics(self, hours: int = 24) -> Dict[str, float]:
         """Get statistical summary of recent readings."""
-        from datetime import timedelta
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_readings = [
-            r for r in self.readings_history 
-            if r.timestamp >= cutoff_time
-        ]
+        values, stamps = self._window()
+        values = values[np.searchsorted(stamps, cutoff_time.timestamp(), side="left"):]
         
-        if not recent_readings:
+        if not values.size:
             return {}
         
-        values = [r.value for r in recent_readings]
-        
         return {
-            "count": len(values),
-            "mean": np.mean(values),
-            "std": np.std(values),
-            "min": np.min(values),
-            "max": np.max(values),
+            "count": values.size,
+            "mean": values.mean(),
+            "std": values.std(),
+            "min": values.min(),
+            "max": values.max(),
             "median": np.median(values),
-            "current": values[-1] if values else None,
+            "current": values[-1],
         }
     
-    def calibrate(self, reference_value: float) -> None:
-        """Calibrate the sensor against a reference value."""
+    def calibrate(self, reference_value: float, duration_s: float = 0.1) -> None:
+        """
+        Calibrate the sensor against a reference value.
+        
+        The sensor stays CALIBRATING for `duration_s` seconds of simulated calibration
+        time without blocking the caller, then reports ACTIVE again.
+        """
         current_reading = self.get_current_reading()
         self._calibration_offset = reference_value - current_reading
+        self._notify_value_change()
+        self._calibration_ready_at = time.monotonic() + duration_s
         self.status = SensorStatus.CALIBRATING
-        
-        # Simulate calibration time
-        import time
-        time.sleep(0.1)
-        
-        self.status = SensorStatus.ACTIVE
     
     def set_maintenance_mode(self, maintenance: bool = True) -> None:
         """Set sensor to maintenance mode."""
@@ -204,23 +429,30 @@ class BaseSensor(ABC):
         self.status = SensorStatus.ACTIVE
         self._calibration_offset = 0.0
         self._current_value = None
+        self._notify_value_change()
         self.readings_history.clear()
+        self._head = 0
+        self._count = 0
         self.last_reading_time = None
     
     def get_sensor_info(self) -> Dict[str, Any]:
         """Get comprehensive sensor information."""
+        if self._info_static is None:
+            self._info_static = {
+                "id": self.id,
+                "name": self.name,
+                "created_at": self.created_at.isoformat(),
+            }
         return {
-            "id": self.id,
-            "name": self.name,
+            **self._info_static,
             "type": self.sensor_type,
+            "unit": self.unit,
+            "normal_range": self.normal_range,
             "status": self.status.value,
             "position": self.position,
             "zone_id": self.zone_id,
-            "unit": self.unit,
-            "normal_range": self.normal_range,
             "accuracy": self.accuracy,
             "sampling_rate": self.sampling_rate,
-            "created_at": self.created_at.isoformat(),
             "last_reading_time": self.last_reading_time.isoformat() if self.last_reading_time else None,
             "readings_count": len(self.readings_history),
             "current_value": self.get_current_reading() if self.is_active() else None,
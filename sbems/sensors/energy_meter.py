@@ -2,9 +2,58 @@
 Energy meter sensor implementation for monitoring electrical consumption.
 """
 
+from bisect import bisect_right
+import time
 import numpy as np
-from typing import Tuple
-from .base_sensor import BaseSensor
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from .base_sensor import BaseSensor, clip_scalar
+from ._jit_kernels import power_kernel
+
+
+# Hour-of-day load patterns (0.0 to 1.0), indexed by hour
+_WEEKDAY_LOAD = np.array([
+    0.05, 0.05, 0.05, 0.05, 0.05, 0.05,
+    # Early morning startup
+    0.3, 0.5, 0.7,
+    # Morning work period
+    0.8, 0.85, 0.9, 0.7,  # Lunch reduction
+    # Afternoon work period
+    0.85, 0.9, 0.95, 0.9, 0.8,
+    # Evening reduction
+    0.5, 0.3, 0.2, 0.15, 0.1,
+    # Night time very low consumption
+    0.05,
+], dtype=np.float32)
+_WEEKEND_LOAD = np.array([
+    0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05,
+    # Late morning start
+    0.2, 0.3, 0.4, 0.5,
+    # Afternoon moderate use
+    0.4, 0.5, 0.4, 0.3,
+    # Evening low use
+    0.25, 0.2, 0.15, 0.1,
+    0.05, 0.05, 0.05,
+], dtype=np.float32)
+
+# Efficiency rating bounds on power factor; a rating starts at its lower bound
+_EFFICIENCY_THRESHOLDS = (0.8, 0.9, 0.95)
+_EFFICIENCY_LABELS = ("poor", "fair", "good", "excellent")
+
+
+# Unit and fixed normal operating range per meter type (power and current scale with the circuit)
+_UNITS = {
+    "power": "W",
+    "voltage": "V",
+    "current": "A",
+    "energy_total": "kWh",
+    "power_factor": "pf"
+}
+_NORMAL_RANGES = {
+    "voltage": (220.0, 240.0),
+    "energy_total": (0.0, 10000.0),  # Arbitrary large number
+    "power_factor": (0.7, 1.0)
+}
 
 
 class EnergyMeter(BaseSensor):
@@ -12,6 +61,12 @@ class EnergyMeter(BaseSensor):
     Energy meter sensor for monitoring electrical power consumption and related metrics.
     """
     
+    __slots__ = (
+        "_meter_type", "_simulator", "circuit_capacity", "base_load",
+        "peak_load_multiplier", "power_factor", "voltage_nominal", "total_energy_consumed",
+        "_last_energy_mono",
+    )
+    
     def __init__(self, meter_type: str = "power", circuit_capacity: float = 1000.0, **kwargs):
         """
         Initialize energy meter sensor.
@@ -32,56 +87,45 @@ class EnergyMeter(BaseSensor):
         
         # Energy tracking
         self.total_energy_consumed = 0.0  # kWh
-        self.last_reading_time = None
+        # Monotonic time of the last energy accumulation step
+        self._last_energy_mono: Optional[float] = None
         
+    @property
+    def meter_type(self) -> str:
+        return self._meter_type
+    
+    @meter_type.setter
+    def meter_type(self, meter_type: str) -> None:
+        # Resolve the simulator once per meter type rather than on every reading
+        self._meter_type = meter_type
+        self._simulator = self._DISPATCH.get(meter_type, EnergyMeter._simulate_default)
+    
     @property
     def sensor_type(self) -> str:
         return f"energy_{self.meter_type}"
     
     @property
     def unit(self) -> str:
-        units = {
-            "power": "W",
-            "voltage": "V", 
-            "current": "A",
-            "energy_total": "kWh",
-            "power_factor": "pf"
-        }
-        return units.get(self.meter_type, "units")
+        return _UNITS.get(self.meter_type, "units")
     
     @property
     def normal_range(self) -> Tuple[float, float]:
-        ranges = {
-            "power": (self.base_load, self.circuit_capacity * self.peak_load_multiplier),
-            "voltage": (220.0, 240.0),
-            "current": (0.0, self.circuit_capacity / self.voltage_nominal),
-            "energy_total": (0.0, 10000.0),  # Arbitrary large number
-            "power_factor": (0.7, 1.0)
-        }
-        return ranges.get(self.meter_type, (0.0, 100.0))
+        if self.meter_type == "power":
+            return (self.base_load, self.circuit_capacity * self.peak_load_multiplier)
+        if self.meter_type == "current":
+            return (0.0, self.circuit_capacity / self.voltage_nominal)
+        return _NORMAL_RANGES.get(self.meter_type, (0.0, 100.0))
     
     def _read_sensor_value(self) -> float:
         """Read energy meter value with realistic simulation."""
-        if self.meter_type == "power":
-            return self._simulate_power_consumption()
-        elif self.meter_type == "voltage":
-            return self._simulate_voltage()
-        elif self.meter_type == "current":
-            return self._simulate_current()
-        elif self.meter_type == "energy_total":
-            return self._simulate_total_energy()
-        elif self.meter_type == "power_factor":
-            return self._simulate_power_factor()
-        else:
-            return np.random.uniform(*self.normal_range)
+        # One clock read per reading, shared by every simulator it involves
+        now = datetime.now()
+        return self._simulator(self, now)
     
-    def _simulate_power_consumption(self) -> float:
+    def _simulate_power_consumption(self, now: datetime) -> float:
         """Simulate realistic power consumption patterns."""
-        from datetime import datetime
-        
-        current_time = datetime.now()
-        hour = current_time.hour
-        weekday = current_time.weekday()
+        hour = now.hour
+        weekday = now.weekday()
         
         # Base load pattern
         if weekday < 5:  # Weekday
@@ -89,114 +133,106 @@ class EnergyMeter(BaseSensor):
         else:  # Weekend
             load_pattern = self._get_weekend_load_pattern(hour)
         
-        # Calculate expected power consumption
-        expected_power = self.base_load + (self.circuit_capacity - self.base_load) * load_pattern
+        # Expected consumption plus random variation (±15%), within circuit capacity
+        return power_kernel(self.base_load, self.circuit_capacity, load_pattern, self._next_normal())
+    
+    def simulate_power_batch(
+        self,
+        n: int,
+        hours: Optional[np.ndarray] = None,
+        weekdays: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Simulate `n` power consumption samples in one vectorized pass.
+        
+        Args:
+            n: Number of samples
+            hours: Hour of day per sample (defaults to the current hour)
+            weekdays: Weekday per sample, 0=Monday (defaults to the current weekday)
         
-        # Add random variation (±15%)
-        variation = np.random.normal(0, expected_power * 0.15)
-        actual_power = expected_power + variation
+        Follows the same model as _simulate_power_consumption, drawing all noise at once.
+        """
+        if hours is None or weekdays is None:
+            current_time = datetime.now()
+            hours = np.full(n, current_time.hour) if hours is None else hours
+            weekdays = np.full(n, current_time.weekday()) if weekdays is None else weekdays
         
-        # Ensure within circuit capacity
+        load_pattern = np.where(weekdays < 5, _WEEKDAY_LOAD[hours], _WEEKEND_LOAD[hours])
+        expected_power = self._expected_power(load_pattern)
+        actual_power = expected_power + 0.15 * expected_power * self._rng.standard_normal(n, dtype=np.float32)
         return np.clip(actual_power, 0, self.circuit_capacity)
     
+    def _expected_power(self, load_pattern):
+        """Expected power draw for a load pattern value (scalar or array)."""
+        return self.base_load + (self.circuit_capacity - self.base_load) * load_pattern
+    
     def _get_weekday_load_pattern(self, hour: int) -> float:
         """Get power load pattern for weekdays (0.0 to 1.0)."""
-        patterns = {
-            # Early morning startup
-            6: 0.3, 7: 0.5, 8: 0.7,
-            # Morning work period
-            9: 0.8, 10: 0.85, 11: 0.9, 12: 0.7,  # Lunch reduction
-            # Afternoon work period
-            13: 0.85, 14: 0.9, 15: 0.95, 16: 0.9, 17: 0.8,
-            # Evening reduction
-            18: 0.5, 19: 0.3, 20: 0.2, 21: 0.15, 22: 0.1,
-        }
-        
-        # Night time very low consumption
-        if hour < 6 or hour > 22:
-            return 0.05
-        
-        return patterns.get(hour, 0.4)
+        return float(_WEEKDAY_LOAD[hour])
     
     def _get_weekend_load_pattern(self, hour: int) -> float:
         """Get power load pattern for weekends (0.0 to 1.0)."""
-        patterns = {
-            # Late morning start
-            9: 0.2, 10: 0.3, 11: 0.4, 12: 0.5,
-            # Afternoon moderate use
-            13: 0.4, 14: 0.5, 15: 0.4, 16: 0.3,
-            # Evening low use
-            17: 0.25, 18: 0.2, 19: 0.15, 20: 0.1,
-        }
-        
-        if hour < 9 or hour > 20:
-            return 0.05
-        
-        return patterns.get(hour, 0.2)
+        return float(_WEEKEND_LOAD[hour])
     
-    def _simulate_voltage(self) -> float:
+    def _simulate_voltage(self, now: datetime) -> float:
         """Simulate voltage readings with realistic variations."""
         # Nominal voltage with small variations
         base_voltage = self.voltage_nominal
         
         # Time-based variations (grid load effects)
-        from datetime import datetime
-        hour = datetime.now().hour
+        hour = now.hour
         
         # Higher load times have slightly lower voltage
         if 8 <= hour <= 18:  # Peak hours
-            voltage_drop = np.random.uniform(2, 8)
+            voltage_drop = self._next_uniform(2, 8)
         else:  # Off-peak hours
-            voltage_drop = np.random.uniform(0, 3)
+            voltage_drop = self._next_uniform(0, 3)
         
         # Random noise
-        noise = np.random.normal(0, 1)
+        noise = self._next_normal()
         
         voltage = base_voltage - voltage_drop + noise
         
-        return np.clip(voltage, 200.0, 250.0)
+        return clip_scalar(voltage, 200.0, 250.0)
     
-    def _simulate_current(self) -> float:
+    def _simulate_current(self, now: datetime) -> float:
         """Simulate current based on power consumption and voltage."""
-        power = self._simulate_power_consumption()
-        voltage = self._simulate_voltage()
+        power = self._simulate_power_consumption(now)
+        voltage = self._simulate_voltage(now)
         
         # Current = Power / Voltage (simplified, not considering power factor here)
         current = power / voltage
         
         # Add small measurement error
-        error = np.random.normal(0, current * 0.02)
+        error = self._next_normal(current * 0.02)
         
-        return max(0, current + error)
+        return max(0.0, current + error)
     
-    def _simulate_total_energy(self) -> float:
+    def _simulate_total_energy(self, now: datetime) -> float:
         """Simulate cumulative energy consumption."""
-        from datetime import datetime, timedelta
-        
-        current_time = datetime.now()
-        
-        if self.last_reading_time is None:
-            self.last_reading_time = current_time
+        now_mono = time.monotonic()
+        if self._last_energy_mono is None:
+            self._last_energy_mono = now_mono
             return self.total_energy_consumed
         
         # Calculate time difference in hours
-        time_diff = (current_time - self.last_reading_time).total_seconds() / 3600
+        time_diff = (now_mono - self._last_energy_mono) / 3600
         
         # Get current power consumption
-        current_power = self._simulate_power_consumption()
+        current_power = self._simulate_power_consumption(now)
         
         # Add energy consumed since last reading (kWh)
         energy_increment = (current_power * time_diff) / 1000
         self.total_energy_consumed += energy_increment
         
-        self.last_reading_time = current_time
+        self._last_energy_mono = now_mono
         
         return self.total_energy_consumed
     
-    def _simulate_power_factor(self) -> float:
+    def _simulate_power_factor(self, now: datetime) -> float:
         """Simulate power factor readings."""
         # Power factor varies with load
-        current_power = self._simulate_power_consumption()
+        current_power = self._simulate_power_consumption(now)
         load_ratio = current_power / self.circuit_capacity
         
         # Lower loads typically have worse power factor
@@ -208,10 +244,10 @@ class EnergyMeter(BaseSensor):
             base_pf = 0.92
         
         # Add small variation
-        variation = np.random.normal(0, 0.03)
+        variation = self._next_normal(0.03)
         pf = base_pf + variation
         
-        return np.clip(pf, 0.5, 1.0)
+        return clip_scalar(pf, 0.5, 1.0)
     
     def get_load_percentage(self) -> float:
         """Get current load as percentage of circuit capacity."""
@@ -228,15 +264,7 @@ class EnergyMeter(BaseSensor):
     def get_efficiency_rating(self) -> str:
         """Get efficiency rating based on power factor and load."""
         if self.meter_type == "power_factor":
-            pf = self.get_current_reading()
-            if pf >= 0.95:
-                return "excellent"
-            elif pf >= 0.9:
-                return "good"
-            elif pf >= 0.8:
-                return "fair"
-            else:
-                return "poor"
+            return _EFFICIENCY_LABELS[bisect_right(_EFFICIENCY_THRESHOLDS, self.get_current_reading())]
         return "unknown"
     
     def calculate_cost(self, rate_per_kwh: float = 0.12) -> float:
@@ -250,3 +278,48 @@ class EnergyMeter(BaseSensor):
         """Reset the total energy counter."""
         if self.meter_type == "energy_total":
             self.total_energy_consumed = 0.0
+
+
+# Meter type -> simulator, looked up once per reading
+EnergyMeter._DISPATCH = {
+    "power": EnergyMeter._simulate_power_consumption,
+    "voltage": EnergyMeter._simulate_voltage,
+    "current": EnergyMeter._simulate_current,
+    "energy_total": EnergyMeter._simulate_total_energy,
+    "power_factor": EnergyMeter._simulate_power_factor,
+}
+
+
+class EnergyMeterFleet:
+    """
+    Power consumption simulation for many energy meters at once.
+    
+    The meters' circuit capacities and base loads are packed into parallel arrays
+    when the fleet is built, so each tick is one vectorized pass over the fleet.
+    Meter i of the fleet is `meters[i]`; ticking does not change the meters.
+    """
+    
+    def __init__(self, meters: Sequence[EnergyMeter]):
+        """Pack the simulation parameters of `meters`."""
+        self.meters: List[EnergyMeter] = list(meters)
+        self.capacities = np.fromiter(
+            (meter.circuit_capacity for meter in self.meters), dtype=np.float32, count=len(self.meters)
+        )
+        self.base_loads = np.fromiter(
+            (meter.base_load for meter in self.meters), dtype=np.float32, count=len(self.meters)
+        )
+        self._rng = np.random.default_rng()
+    
+    def __len__(self) -> int:
+        return len(self.meters)
+    
+    def tick(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Simulate one power consumption sample (W) per meter for the hour of `now`."""
+        now = now or datetime.now()
+        load_pattern = (_WEEKDAY_LOAD if now.weekday() < 5 else _WEEKEND_LOAD)[now.hour]
+        
+        expected = self.base_loads + (self.capacities - self.base_loads) * load_pattern
+        actual = self._rng.standard_normal(len(self.meters), dtype=np.float32)
+        actual *= 0.15 * expected
+        actual += expected
+        return np.clip(actual, 0, self.capacities, out=actual)
@@ -2,9 +2,39 @@
 Lighting sensor implementation for monitoring light levels and energy consumption.
 """
 
+from bisect import bisect_right
 import numpy as np
-from typing import Tuple
-from .base_sensor import BaseSensor
+from datetime import datetime
+from typing import Optional, Tuple
+from .base_sensor import BaseSensor, clip_scalar
+from ._jit_kernels import natural_light_kernel, natural_light_ufunc
+
+
+# Brightness category bounds in lux; a category starts at its lower bound
+_BRIGHTNESS_THRESHOLDS = (100, 300, 600)
+_BRIGHTNESS_LABELS = ("dim", "moderate", "bright", "very_bright")
+
+# Artificial light by hour of day: base lux and the occupancy factor range
+# (office hours 8-18, evening until 22, night otherwise), as in _calculate_artificial_light
+_HOURS = np.arange(24)
+_OFFICE_HOURS = (_HOURS >= 8) & (_HOURS <= 18)
+_EVENING_HOURS = (_HOURS > 18) & (_HOURS <= 22)
+_ARTIFICIAL_BASE = np.select([_OFFICE_HOURS, _EVENING_HOURS], [400.0, 200.0], 50.0).astype(np.float32)
+_ARTIFICIAL_LOW = np.select([_OFFICE_HOURS, _EVENING_HOURS], [0.5, 0.3], 0.1).astype(np.float32)
+_ARTIFICIAL_HIGH = np.select([_OFFICE_HOURS, _EVENING_HOURS], [1.0, 0.8], 0.3).astype(np.float32)
+
+
+# Unit and normal operating range per lighting type
+_UNITS = {
+    "illuminance": "lux",
+    "energy": "W",
+    "dimmer_level": "%"
+}
+_NORMAL_RANGES = {
+    "illuminance": (50.0, 1000.0),
+    "energy": (0.0, 100.0),
+    "dimmer_level": (0.0, 100.0)
+}
 
 
 class LightingSensor(BaseSensor):
@@ -12,6 +42,11 @@ class LightingSensor(BaseSensor):
     Lighting sensor for monitoring illuminance and lighting energy consumption.
     """
     
+    __slots__ = (
+        "_lighting_type", "_simulator", "max_illuminance", "min_illuminance",
+        "natural_light_factor", "artificial_light_power",
+    )
+    
     def __init__(self, lighting_type: str = "illuminance", **kwargs):
         """
         Initialize lighting sensor.
@@ -28,46 +63,35 @@ class LightingSensor(BaseSensor):
         self.natural_light_factor = 0.7  # How much natural light affects readings
         self.artificial_light_power = 20  # Watts per fixture
         
+    @property
+    def lighting_type(self) -> str:
+        return self._lighting_type
+    
+    @lighting_type.setter
+    def lighting_type(self, lighting_type: str) -> None:
+        # Resolve the simulator once per lighting type rather than on every reading
+        self._lighting_type = lighting_type
+        self._simulator = self._DISPATCH.get(lighting_type, LightingSensor._simulate_default)
+    
     @property
     def sensor_type(self) -> str:
         return f"lighting_{self.lighting_type}"
     
     @property
     def unit(self) -> str:
-        units = {
-            "illuminance": "lux",
-            "energy": "W",
-            "dimmer_level": "%"
-        }
-        return units.get(self.lighting_type, "units")
+        return _UNITS.get(self.lighting_type, "units")
     
     @property
     def normal_range(self) -> Tuple[float, float]:
-        ranges = {
-            "illuminance": (50.0, 1000.0),
-            "energy": (0.0, 100.0),
-            "dimmer_level": (0.0, 100.0)
-        }
-        return ranges.get(self.lighting_type, (0.0, 100.0))
+        return _NORMAL_RANGES.get(self.lighting_type, (0.0, 100.0))
     
     def _read_sensor_value(self) -> float:
         """Read lighting sensor value with realistic simulation."""
-        if self.lighting_type == "illuminance":
-            return self._simulate_illuminance()
-        elif self.lighting_type == "energy":
-            return self._simulate_energy_consumption()
-        elif self.lighting_type == "dimmer_level":
-            return self._simulate_dimmer_level()
-        else:
-            return np.random.uniform(*self.normal_range)
+        now = datetime.now()
+        return self._simulator(self, now)
     
-    def _simulate_illuminance(self) -> float:
+    def _simulate_illuminance(self, current_time: datetime) -> float:
         """Simulate realistic illuminance readings."""
-        from datetime import datetime
-        import math
-        
-        current_time = datetime.now()
-        
         # Natural light contribution based on time of day
         natural_light = self._calculate_natural_light(current_time)
         
@@ -78,31 +102,41 @@ class LightingSensor(BaseSensor):
         total_illuminance = natural_light + artificial_light
         
         # Add some random variation
-        noise = np.random.normal(0, total_illuminance * 0.05)
+        noise = self._next_normal(total_illuminance * 0.05)
         
         illuminance = total_illuminance + noise
         
-        return np.clip(illuminance, 0.0, 2000.0)
+        return clip_scalar(illuminance, 0.0, 2000.0)
     
-    def _calculate_natural_light(self, current_time) -> float:
-        """Calculate natural light contribution based on time of day."""
-        import math
+    def simulate_illuminance_batch(self, n: int, hours: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simulate `n` illuminance samples in one vectorized pass.
         
-        hour = current_time.hour
+        Args:
+            n: Number of samples
+            hours: Hour of day per sample (defaults to the current hour)
+        
+        Follows the same model as _simulate_illuminance, drawing all randomness at once.
+        """
+        if hours is None:
+            hours = np.full(n, datetime.now().hour)
+        
+        weather_factor = 0.3 + 0.7 * self._rng.random(n, dtype=np.float32)  # Cloudy vs sunny
+        natural_light = natural_light_ufunc(hours, weather_factor, self.natural_light_factor)
         
-        if 6 <= hour <= 18:  # Daytime
-            # Peak natural light at noon
-            hour_angle = 2 * math.pi * (hour - 12) / 12
-            natural_light_factor = (math.cos(hour_angle) + 1) / 2
-            max_natural_light = 800  # Maximum natural light in lux
-            natural_light = max_natural_light * natural_light_factor
-        else:  # Nighttime
-            natural_light = 0
+        low = _ARTIFICIAL_LOW[hours]
+        occupancy_factor = low + (_ARTIFICIAL_HIGH[hours] - low) * self._rng.random(n, dtype=np.float32)
+        total_illuminance = natural_light + _ARTIFICIAL_BASE[hours] * occupancy_factor
         
+        illuminance = total_illuminance + 0.05 * total_illuminance * self._rng.standard_normal(n, dtype=np.float32)
+        return np.clip(illuminance, 0.0, 2000.0)
+    
+    def _calculate_natural_light(self, current_time) -> float:
+        """Calculate natural light contribution based on time of day."""
         # Weather effects (simplified)
-        weather_factor = np.random.uniform(0.3, 1.0)  # Cloudy vs sunny
+        weather_factor = self._next_uniform(0.3, 1.0)  # Cloudy vs sunny
         
-        return natural_light * weather_factor * self.natural_light_factor
+        return natural_light_kernel(current_time.hour, weather_factor, self.natural_light_factor)
     
     def _calculate_artificial_light(self, current_time) -> float:
         """Calculate artificial light contribution."""
@@ -113,38 +147,35 @@ class LightingSensor(BaseSensor):
             # High artificial light during office hours
             base_artificial = 400
             # Random variation based on occupancy
-            occupancy_factor = np.random.uniform(0.5, 1.0)
+            occupancy_factor = self._next_uniform(0.5, 1.0)
         elif 18 < hour <= 22:
             # Moderate artificial light in evening
             base_artificial = 200
-            occupancy_factor = np.random.uniform(0.3, 0.8)
+            occupancy_factor = self._next_uniform(0.3, 0.8)
         else:
             # Low artificial light at night
             base_artificial = 50
-            occupancy_factor = np.random.uniform(0.1, 0.3)
+            occupancy_factor = self._next_uniform(0.1, 0.3)
         
         return base_artificial * occupancy_factor
     
-    def _simulate_energy_consumption(self) -> float:
+    def _simulate_energy_consumption(self, current_time: datetime) -> float:
         """Simulate lighting energy consumption."""
-        from datetime import datetime
-        
-        current_time = datetime.now()
         hour = current_time.hour
         
         # Base energy consumption based on time of day
         if 8 <= hour <= 18:  # Office hours
             base_consumption = self.artificial_light_power * 0.8
-            variation_factor = np.random.uniform(0.7, 1.0)
+            variation_factor = self._next_uniform(0.7, 1.0)
         elif 18 < hour <= 22:  # Evening
             base_consumption = self.artificial_light_power * 0.5
-            variation_factor = np.random.uniform(0.4, 0.8)
+            variation_factor = self._next_uniform(0.4, 0.8)
         else:  # Night
             base_consumption = self.artificial_light_power * 0.2
-            variation_factor = np.random.uniform(0.1, 0.4)
+            variation_factor = self._next_uniform(0.1, 0.4)
         
         # Occupancy effect
-        occupancy_factor = np.random.uniform(0.5, 1.2)
+        occupancy_factor = self._next_uniform(0.5, 1.2)
         
         # Natural light dimming effect
         natural_light = self._calculate_natural_light(current_time)
@@ -152,14 +183,10 @@ class LightingSensor(BaseSensor):
         
         energy = base_consumption * variation_factor * occupancy_factor * dimming_factor
         
-        return np.clip(energy, 0.0, self.artificial_light_power * 1.5)
+        return clip_scalar(energy, 0.0, self.artificial_light_power * 1.5)
     
-    def _simulate_dimmer_level(self) -> float:
+    def _simulate_dimmer_level(self, current_time: datetime) -> float:
         """Simulate dimmer level (0-100%)."""
-        from datetime import datetime
-        
-        current_time = datetime.now()
-        
         # Natural light affects dimmer level
         natural_light = self._calculate_natural_light(current_time)
         
@@ -169,13 +196,13 @@ class LightingSensor(BaseSensor):
         # Time-based adjustments
         hour = current_time.hour
         if 8 <= hour <= 18:  # Office hours
-            time_adjustment = np.random.uniform(-10, 10)
+            time_adjustment = self._next_uniform(-10, 10)
         else:
-            time_adjustment = np.random.uniform(-20, 0)
+            time_adjustment = self._next_uniform(-20, 0)
         
         dimmer_level = base_dimmer + time_adjustment
         
-        return np.clip(dimmer_level, 0.0, 100.0)
+        return clip_scalar(dimmer_level, 0.0, 100.0)
     
     def is_energy_efficient(self) -> bool:
         """Check if lighting is operating efficiently."""
@@ -188,13 +215,13 @@ class LightingSensor(BaseSensor):
     def get_brightness_category(self) -> str:
         """Get brightness category based on current illuminance."""
         if self.lighting_type == "illuminance":
-            illuminance = self.get_current_reading()
-            if illuminance < 100:
-                return "dim"
-            elif illuminance < 300:
-                return "moderate"
-            elif illuminance < 600:
-                return "bright"
-            else:
-                return "very_bright"
+            return _BRIGHTNESS_LABELS[bisect_right(_BRIGHTNESS_THRESHOLDS, self.get_current_reading())]
         return "unknown"
+
+
+# Lighting type -> simulator, looked up once per reading
+LightingSensor._DISPATCH = {
+    "illuminance": LightingSensor._simulate_illuminance,
+    "energy": LightingSensor._simulate_energy_consumption,
+    "dimmer_level": LightingSensor._simulate_dimmer_level,
+}
@@ -2,9 +2,53 @@
 Occupancy sensor implementation for monitoring people count and movement.
 """
 
+from bisect import bisect_left
 import numpy as np
-from typing import Tuple
+from datetime import datetime
+from typing import Optional, Tuple
 from .base_sensor import BaseSensor
+from ._jit_kernels import people_count_kernel
+
+
+# Hour-of-day occupancy patterns (0.0 to 1.0), indexed by hour
+_WEEKDAY_OCCUPANCY = np.array([
+    0.01, 0.01, 0.01, 0.01, 0.01, 0.01,  # Very low occupancy overnight
+    # Early morning (6-9)
+    0.1, 0.3, 0.7, 0.9,
+    # Morning work (9-12)
+    0.95, 0.9, 0.7,  # Lunch dip
+    # Afternoon work (13-17)
+    0.85, 0.9, 0.95, 0.9, 0.8,
+    # Evening (18-22)
+    0.4, 0.2, 0.1, 0.05, 0.02,
+    0.01,
+], dtype=np.float32)
+_WEEKEND_OCCUPANCY = np.array([
+    0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.05,  # Low weekend occupancy
+    # Late morning start
+    0.1, 0.3, 0.4, 0.5,
+    # Afternoon activity
+    0.4, 0.6, 0.5, 0.4,
+    # Evening wind down
+    0.3, 0.2, 0.15, 0.1,
+    0.05, 0.05, 0.05,
+], dtype=np.float32)
+
+# Occupancy level bounds on the occupied fraction; a level includes its upper bound
+_OCCUPANCY_THRESHOLDS = (0.0, 0.25, 0.5, 0.75)
+_OCCUPANCY_LABELS = ("empty", "low", "moderate", "high", "full")
+
+
+# Unit and fixed normal operating range per occupancy type (people_count scales with max_occupancy)
+_UNITS = {
+    "people_count": "people",
+    "motion": "boolean",
+    "presence": "boolean"
+}
+_NORMAL_RANGES = {
+    "motion": (0.0, 1.0),
+    "presence": (0.0, 1.0)
+}
 
 
 class OccupancySensor(BaseSensor):
@@ -12,6 +56,11 @@ class OccupancySensor(BaseSensor):
     Occupancy sensor for monitoring people count, movement, and presence.
     """
     
+    __slots__ = (
+        "_occupancy_type", "_simulator", "max_occupancy", "motion_sensitivity",
+        "presence_timeout", "last_motion_time",
+    )
+    
     def __init__(self, occupancy_type: str = "people_count", max_occupancy: int = 20, **kwargs):
         """
         Initialize occupancy sensor.
@@ -29,46 +78,39 @@ class OccupancySensor(BaseSensor):
         self.presence_timeout = 300  # Seconds before presence times out
         self.last_motion_time = None
         
+    @property
+    def occupancy_type(self) -> str:
+        return self._occupancy_type
+    
+    @occupancy_type.setter
+    def occupancy_type(self, occupancy_type: str) -> None:
+        # Resolve the simulator once per occupancy type rather than on every reading
+        self._occupancy_type = occupancy_type
+        self._simulator = self._DISPATCH.get(occupancy_type, OccupancySensor._simulate_default)
+    
     @property
     def sensor_type(self) -> str:
         return f"occupancy_{self.occupancy_type}"
     
     @property
     def unit(self) -> str:
-        units = {
-            "people_count": "people",
-            "motion": "boolean",
-            "presence": "boolean"
-        }
-        return units.get(self.occupancy_type, "units")
+        return _UNITS.get(self.occupancy_type, "units")
     
     @property
     def normal_range(self) -> Tuple[float, float]:
-        ranges = {
-            "people_count": (0.0, float(self.max_occupancy)),
-            "motion": (0.0, 1.0),
-            "presence": (0.0, 1.0)
-        }
-        return ranges.get(self.occupancy_type, (0.0, 100.0))
+        if self.occupancy_type == "people_count":
+            return (0.0, float(self.max_occupancy))
+        return _NORMAL_RANGES.get(self.occupancy_type, (0.0, 100.0))
     
     def _read_sensor_value(self) -> float:
         """Read occupancy sensor value with realistic simulation."""
-        if self.occupancy_type == "people_count":
-            return self._simulate_people_count()
-        elif self.occupancy_type == "motion":
-            return self._simulate_motion_detection()
-        elif self.occupancy_type == "presence":
-            return self._simulate_presence_detection()
-        else:
-            return np.random.uniform(*self.normal_range)
+        now = datetime.now()
+        return self._simulator(self, now)
     
-    def _simulate_people_count(self) -> float:
+    def _simulate_people_count(self, now: datetime) -> float:
         """Simulate realistic people count based on time and day."""
-        from datetime import datetime
-        
-        current_time = datetime.now()
-        hour = current_time.hour
-        weekday = current_time.weekday()  # 0=Monday, 6=Sunday
+        hour = now.hour
+        weekday = now.weekday()  # 0=Monday, 6=Sunday
         
         # Base occupancy patterns
         if weekday < 5:  # Weekday
@@ -76,57 +118,54 @@ class OccupancySensor(BaseSensor):
         else:  # Weekend
             occupancy_pattern = self._get_weekend_pattern(hour)
         
-        # Calculate expected occupancy
-        expected_occupancy = self.max_occupancy * occupancy_pattern
+        # Expected occupancy plus random variation, as a non-negative integer
+        return people_count_kernel(self.max_occupancy, occupancy_pattern, self._next_normal())
+    
+    def simulate_batch(
+        self,
+        n: int,
+        hours: Optional[np.ndarray] = None,
+        weekdays: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulate `n` (people count, motion detected) samples in one vectorized pass.
         
-        # Add random variation
-        variation = np.random.normal(0, expected_occupancy * 0.2)
-        actual_occupancy = expected_occupancy + variation
+        Args:
+            n: Number of samples
+            hours: Hour of day per sample (defaults to the current hour)
+            weekdays: Weekday per sample, 0=Monday (defaults to the current weekday)
         
-        # Ensure non-negative integer
-        return max(0, round(actual_occupancy))
+        Follows the same models as _simulate_people_count and _simulate_motion_detection,
+        without updating last_motion_time.
+        """
+        if hours is None or weekdays is None:
+            current_time = datetime.now()
+            hours = np.full(n, current_time.hour) if hours is None else hours
+            weekdays = np.full(n, current_time.weekday()) if weekdays is None else weekdays
+        
+        pattern = np.where(weekdays < 5, _WEEKDAY_OCCUPANCY[hours], _WEEKEND_OCCUPANCY[hours])
+        expected_occupancy = self.max_occupancy * pattern
+        actual_occupancy = expected_occupancy + 0.2 * expected_occupancy * self._rng.standard_normal(n, dtype=np.float32)
+        counts = np.maximum(0, np.rint(actual_occupancy)).astype(np.int64)
+        
+        # Higher people count = higher motion probability, then sensitivity
+        motion_probability = np.select([counts == 0, counts <= 2], [0.01, 0.3], default=0.8)
+        detected = self._rng.random(n, dtype=np.float32) < motion_probability
+        motion = detected & (self._rng.random(n, dtype=np.float32) < self.motion_sensitivity)
+        return counts, motion
     
     def _get_weekday_pattern(self, hour: int) -> float:
         """Get occupancy pattern for weekdays (0.0 to 1.0)."""
-        patterns = {
-            # Early morning (6-9)
-            6: 0.1, 7: 0.3, 8: 0.7, 9: 0.9,
-            # Morning work (9-12)
-            10: 0.95, 11: 0.9, 12: 0.7,  # Lunch dip
-            # Afternoon work (13-17)
-            13: 0.85, 14: 0.9, 15: 0.95, 16: 0.9, 17: 0.8,
-            # Evening (18-22)
-            18: 0.4, 19: 0.2, 20: 0.1, 21: 0.05, 22: 0.02,
-        }
-        
-        # Default pattern for unlisted hours
-        if hour < 6 or hour > 22:
-            return 0.01  # Very low occupancy
-        
-        return patterns.get(hour, 0.5)
+        return float(_WEEKDAY_OCCUPANCY[hour])
     
     def _get_weekend_pattern(self, hour: int) -> float:
         """Get occupancy pattern for weekends (0.0 to 1.0)."""
-        patterns = {
-            # Late morning start
-            9: 0.1, 10: 0.3, 11: 0.4, 12: 0.5,
-            # Afternoon activity
-            13: 0.4, 14: 0.6, 15: 0.5, 16: 0.4,
-            # Evening wind down
-            17: 0.3, 18: 0.2, 19: 0.15, 20: 0.1,
-        }
-        
-        if hour < 9 or hour > 20:
-            return 0.05  # Low weekend occupancy
-        
-        return patterns.get(hour, 0.2)
+        return float(_WEEKEND_OCCUPANCY[hour])
     
-    def _simulate_motion_detection(self) -> float:
+    def _simulate_motion_detection(self, now: datetime) -> float:
         """Simulate motion detection (0 = no motion, 1 = motion detected)."""
-        from datetime import datetime
-        
         # Get current people count to influence motion detection
-        people_count = self._simulate_people_count()
+        people_count = self._simulate_people_count(now)
         
         # Higher people count = higher motion probability
         if people_count == 0:
@@ -137,52 +176,37 @@ class OccupancySensor(BaseSensor):
             motion_probability = 0.8  # High motion with many people
         
         # Random motion events
-        random_motion = np.random.random() < motion_probability
+        random_motion = self._next_uniform() < motion_probability
         
         # Apply sensitivity
-        if random_motion and np.random.random() < self.motion_sensitivity:
-            self.last_motion_time = datetime.now()
+        if random_motion and self._next_uniform() < self.motion_sensitivity:
+            self.last_motion_time = now
             return 1.0
         else:
             return 0.0
     
-    def _simulate_presence_detection(self) -> float:
+    def _simulate_presence_detection(self, now: datetime) -> float:
         """Simulate presence detection (0 = no presence, 1 = presence detected)."""
-        from datetime import datetime
-        
-        current_time = datetime.now()
-        
         # Check if there was recent motion
         if (self.last_motion_time and 
-            (current_time - self.last_motion_time).total_seconds() < self.presence_timeout):
+            (now - self.last_motion_time).total_seconds() < self.presence_timeout):
             return 1.0
         
         # Otherwise, base presence on people count
-        people_count = self._simulate_people_count()
+        people_count = self._simulate_people_count(now)
         
         if people_count > 0:
             # High probability of presence detection when people are present
-            return 1.0 if np.random.random() < 0.95 else 0.0
+            return 1.0 if self._next_uniform() < 0.95 else 0.0
         else:
             # Low false positive rate when no one is present
-            return 1.0 if np.random.random() < 0.02 else 0.0
+            return 1.0 if self._next_uniform() < 0.02 else 0.0
     
     def get_occupancy_level(self) -> str:
         """Get occupancy level category."""
         if self.occupancy_type == "people_count":
-            count = self.get_current_reading()
-            ratio = count / self.max_occupancy
-            
-            if ratio == 0:
-                return "empty"
-            elif ratio <= 0.25:
-                return "low"
-            elif ratio <= 0.5:
-                return "moderate"
-            elif ratio <= 0.75:
-                return "high"
-            else:
-                return "full"
+            ratio = self.get_current_reading() / self.max_occupancy
+            return _OCCUPANCY_LABELS[bisect_left(_OCCUPANCY_THRESHOLDS, ratio)]
         return "unknown"
     
     def is_occupied(self) -> bool:
@@ -199,3 +223,11 @@ class OccupancySensor(BaseSensor):
             current_count = self.get_current_reading()
             return min(1.0, current_count / self.max_occupancy)
         return 0.0
+
+
+# Occupancy type -> simulator, looked up once per reading
+OccupancySensor._DISPATCH = {
+    "people_count": OccupancySensor._simulate_people_count,
+    "motion": OccupancySensor._simulate_motion_detection,
+    "presence": OccupancySensor._simulate_presence_detection,
+}
@@ -2,62 +2,79 @@
 Setup configuration for Smart Building Energy Management System (SBEMS).
 """
 
-from setuptools import setup, find_packages
-
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
-
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
-
-setup(
-    name="smart-building-energy-management",
-    version="1.0.0",
-    author="Your Name",
-    author_email="your.email@example.com",
-    description="A comprehensive Smart Building Energy Management System with ML-powered anomaly detection",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/yourusername/smart-building-energy-management",
-    packages=find_packages(),
-    classifiers=[
-        "Development Status :: 4 - Beta",
-        "Intended Audience :: Developers",
-        "Intended Audience :: Science/Research",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Topic :: Scientific/Engineering :: Artificial Intelligence",
-        "Topic :: Home Automation",
-        "Topic :: Software Development :: Libraries :: Python Modules",
-    ],
-    python_requires=">=3.9",
-    install_requires=requirements,
-    extras_require={
-        "dev": [
-            "pytest>=7.4.0",
-            "pytest-cov>=4.1.0",
-            "black>=23.7.0",
-            "flake8>=6.0.0",
-            "mypy>=1.5.0",
-            "pre-commit>=3.3.0",
-        ],
-        "sensors": [
-            "pyserial>=3.5",
-            "paho-mqtt>=1.6.0",
-        ],
-    },
-    entry_points={
-        "console_scripts": [
-            "sbems=sbems.main:main",
-            "sbems-server=sbems.api.server:main",
+# Listed explicitly rather than discovered with find_packages(), to skip walking the tree
+PACKAGES = ["sbems", "sbems.analytics", "sbems.api", "sbems.core", "sbems.sensors"]
+
+
+def _slurp(path):
+    """Read a whole text file."""
+    with open(path, "r", encoding="utf-8") as fh:
+        return fh.read()
+
+
+def _cfg():
+    """Build the setup() arguments; file reads only happen when the package is being built."""
+    long_description = _slurp("README.md")
+    requirements = [
+        line.strip() for line in _slurp("requirements.txt").splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+
+    return dict(
+        name="smart-building-energy-management",
+        version="1.0.0",
+        author="Your Name",
+        author_email="your.email@example.com",
+        description="A comprehensive Smart Building Energy Management System with ML-powered anomaly detection",
+        long_description=long_description,
+        long_description_content_type="text/markdown",
+        url="https://github.com/yourusername/smart-building-energy-management",
+        packages=PACKAGES,
+        classifiers=[
+            "Development Status :: 4 - Beta",
+            "Intended Audience :: Developers",
+            "Intended Audience :: Science/Research",
+            "License :: OSI Approved :: MIT License",
+            "Operating System :: OS Independent",
+            "Programming Language :: Python :: 3",
+            "Programming Language :: Python :: 3.9",
+            "Programming Language :: Python :: 3.10",
+            "Programming Language :: Python :: 3.11",
+            "Topic :: Scientific/Engineering :: Artificial Intelligence",
+            "Topic :: Home Automation",
+            "Topic :: Software Development :: Libraries :: Python Modules",
         ],
-    },
-    include_package_data=True,
-    package_data={
-        "sbems": ["config/*.yaml", "web/templates/*", "web/static/*"],
-    },
-)
+        python_requires=">=3.9",
+        install_requires=requirements,
+        extras_require={
+            "dev": [
+                "pytest>=7.4.0",
+                "pytest-cov>=4.1.0",
+                "pytest-xdist>=3.3.0",
+                "black>=23.7.0",
+                "flake8>=6.0.0",
+                "mypy>=1.5.0",
+                "pre-commit>=3.3.0",
+            ],
+            "sensors": [
+                "pyserial>=3.5",
+                "paho-mqtt>=1.6.0",
+            ],
+        },
+        entry_points={
+            "console_scripts": [
+                "sbems=sbems.main:main",
+                "sbems-server=sbems.api.server:main",
+            ],
+        },
+        # Authoritative list of data files; no include_package_data scan of the source tree
+        package_data={
+            "sbems": ["config/*.yaml", "web/templates/*", "web/static/*"],
+        },
+    )
+
+
+if __name__ == "__main__":
+    from setuptools import setup
+
+    setup(**_cfg())
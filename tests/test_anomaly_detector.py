@@ -0,0 +1,123 @@
+"""
+Unit tests for the anomaly detector's columnar anomaly storage and reading windows.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from sbems.analytics.anomaly_detector import (
+    Anomaly, AnomalyBuffer, AnomalyDetector, AnomalyType, SeverityLevel, _to_ns,
+)
+
+
+def make_anomalies(now, count):
+    """Reference Anomaly objects, one hour apart going back from `now`, cycling types and severities."""
+    types = list(AnomalyType)
+    levels = list(SeverityLevel)
+    return [
+        Anomaly(
+            sensor_id=f"sensor_{k % 3}",
+            anomaly_type=types[k % len(types)],
+            severity=levels[k % len(levels)],
+            confidence=0.1 * k,
+            timestamp=now - timedelta(hours=k),
+            value=100.0 + k,
+            expected_range=(float(k), float(k + 10)),
+            description=f"anomaly {k}",
+            recommendations=["Check sensor"],
+            metadata={"k": k},
+        )
+        for k in range(count)
+    ]
+
+
+def fill(buffer, anomalies):
+    """Append reference anomalies to a buffer."""
+    for a in anomalies:
+        buffer.append(
+            a.sensor_id, a.anomaly_type, a.severity, a.confidence, _to_ns(a.timestamp), a.value,
+            a.expected_range, a.description, tuple(a.recommendations), a.metadata,
+        )
+    return buffer
+
+
+def test_buffer_grows_past_capacity_and_round_trips():
+    """Appending beyond the initial capacity keeps every anomaly, materialized unchanged."""
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    anomalies = make_anomalies(now, 9)
+    buffer = fill(AnomalyBuffer(capacity=2), anomalies)
+
+    assert len(buffer) == 9
+    assert buffer._types.shape[0] >= 9
+    assert list(buffer) == anomalies
+    assert buffer[-1] == anomalies[-1]
+    assert list(buffer[2:5]) == anomalies[2:5]
+
+
+def test_buffer_extend_take_and_filters():
+    """extend/take/since/at_least agree with filtering the list of Anomaly objects."""
+    now = datetime(2024, 1, 1, 12)
+    anomalies = make_anomalies(now, 8)
+    buffer = fill(AnomalyBuffer(capacity=1), anomalies[:3])
+    buffer.extend(fill(AnomalyBuffer(capacity=1), anomalies[3:]))
+    assert list(buffer) == anomalies
+
+    cutoff = now - timedelta(hours=4)
+    recent = buffer.since(cutoff, sensor_id="sensor_1")
+    assert list(buffer.take(recent)) == [
+        a for a in anomalies if a.timestamp >= cutoff and a.sensor_id == "sensor_1"
+    ]
+    severe = buffer.at_least(SeverityLevel.HIGH)
+    assert list(buffer.take(severe)) == [
+        a for a in anomalies if a.severity in (SeverityLevel.HIGH, SeverityLevel.CRITICAL)
+    ]
+
+    buffer.clear()
+    assert len(buffer) == 0 and list(buffer) == []
+
+
+def test_summary_and_cleanup_match_list_of_anomalies():
+    """get_anomaly_summary and clear_old_anomalies match the list-based implementation."""
+    detector = AnomalyDetector()
+    # Half an hour off the hour grid, so no anomaly sits on a summary cutoff
+    clock = datetime.now()
+    now = clock - timedelta(minutes=30)
+    anomalies = make_anomalies(now, 12)
+    fill(detector.detected_anomalies, anomalies)
+
+    cutoff = clock - timedelta(hours=6)
+    recent = [a for a in anomalies if a.timestamp >= cutoff]
+    summary = detector.get_anomaly_summary(hours=6)
+    assert summary["total_anomalies"] == len(recent)
+    assert summary["by_severity"] == {
+        level.value: sum(a.severity == level for a in recent) for level in SeverityLevel
+    }
+    assert summary["by_type"] == {
+        atype.value: sum(a.anomaly_type == atype for a in recent) for atype in AnomalyType
+    }
+    assert summary["most_recent"] == recent[0].timestamp.isoformat()
+    assert sorted(summary["critical_sensors"]) == sorted(
+        {a.sensor_id for a in recent if a.severity == SeverityLevel.CRITICAL}
+    )
+
+    fill(detector.detected_anomalies, make_anomalies(now - timedelta(days=7), 2))
+    assert detector.clear_old_anomalies(days=7) == 2
+    assert list(detector.detected_anomalies) == anomalies
+
+
+def test_reading_window_wraps_around():
+    """After more readings than the window holds, only the latest remain, in order."""
+    detector = AnomalyDetector(window_size=5)
+    start = datetime(2024, 1, 1)
+    for k in range(12):
+        detector.add_sensor_reading("temp", float(k), start + timedelta(minutes=k), "hvac_temperature")
+
+    ts_ns, values = detector._window("temp")
+    np.testing.assert_array_equal(values, np.arange(7, 12, dtype=np.float32))
+    np.testing.assert_array_equal(
+        ts_ns, [_to_ns(start + timedelta(minutes=k)) for k in range(7, 12)]
+    )
+    count, mean, _ = detector.welford_full["temp"]
+    assert count == 5
+    assert np.isclose(mean, 9.0)
@@ -0,0 +1,67 @@
+"""
+Tests for the building's incrementally maintained sensor network.
+"""
+
+import numpy as np
+
+from sbems.analytics.anomaly_detector import AnomalyDetector
+from sbems.core.building import Building, BuildingInfo, Zone, SENSOR_LINK_RANGE
+from sbems.sensors.hvac_sensor import HVACSensor
+
+
+def make_building():
+    """Empty two-zone building."""
+    building = Building(BuildingInfo("Network Building", "1 Graph St", 500.0, 1, "office", 2020, "B"))
+    building.add_zone(Zone("zone_a", "Zone A", 50.0, 1, "office", 5, (0.0, 0.0, 0.0)))
+    building.add_zone(Zone("zone_b", "Zone B", 50.0, 1, "office", 5, (100.0, 0.0, 0.0)))
+    return building
+
+
+def add_hvac(building, sensor_id, position, zone_id=None):
+    """Add a temperature sensor at a position, optionally inside a zone."""
+    building.add_sensor(HVACSensor(hvac_type="temperature", sensor_id=sensor_id, position=position), zone_id)
+
+
+def test_extended_edges_match_full_rebuild():
+    """Edges patched in across several add_sensor calls equal a from-scratch rebuild."""
+    building = make_building()
+    layout = [
+        ("a1", (0.0, 0.0, 0.0), "zone_a"),
+        # Exactly at the link range: neither proximity- nor zone-linked to a1
+        ("b1", (SENSOR_LINK_RANGE, 0.0, 0.0), "zone_b"),
+        ("n1", (100.0, 100.0, 0.0), None),
+        ("b2", (200.0, 0.0, 0.0), "zone_b"),
+        ("n2", (-100.0, 100.0, 0.0), None),
+        ("a2", (0.0, SENSOR_LINK_RANGE - 0.5, 0.0), "zone_a"),
+        ("n3", (SENSOR_LINK_RANGE, SENSOR_LINK_RANGE, 0.0), None),
+    ]
+    # Query between additions so every later sensor goes through the patch path
+    for batch in (layout[:2], layout[2:3], layout[3:6], layout[6:]):
+        for sensor_id, position, zone_id in batch:
+            add_hvac(building, sensor_id, position, zone_id)
+        ids, edges = building.get_sensor_network_edges()
+
+    _, positions = building._get_position_index()
+    np.testing.assert_array_equal(edges, building._build_network_edges(positions))
+
+    linked = {frozenset((ids[i], ids[j])) for i, j in edges.tolist()}
+    assert frozenset(("a1", "b1")) not in linked
+    assert frozenset(("b1", "n3")) not in linked
+    assert frozenset(("b1", "b2")) in linked
+    assert frozenset(("n1", "n2")) in linked
+
+
+def test_update_network_graph_rebuilds_after_edges_only_update():
+    """A graph requested after an edges-only update reflects the current sensor set."""
+    building = make_building()
+    detector = AnomalyDetector()
+    add_hvac(building, "a1", (0.0, 0.0, 0.0), "zone_a")
+    detector.update_network_graph(building, build_graph=True)
+
+    add_hvac(building, "a2", (1.0, 0.0, 0.0), "zone_a")
+    detector.update_network_graph(building)
+    assert detector.network_nodes == ["a1", "a2"]
+
+    detector.update_network_graph(building, build_graph=True)
+    assert set(detector.network_graph.nodes) == {"a1", "a2"}
+    assert detector.network_graph.has_edge("a1", "a2")
@@ -0,0 +1,100 @@
+"""
+Unit tests for the monitoring system's collection paths and reading history.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sbems.core.monitoring_system import (
+    MonitoringConfig, MonitoringSystem, ReadingHistory, _entries_since, _epoch_us, epoch_us_to_iso,
+)
+from sbems.sensors.hvac_sensor import HVACSensor
+
+
+def test_sync_loop_is_default():
+    """The thread-based loop stays the default; asyncio is opt-in."""
+    assert MonitoringConfig().use_asyncio is False
+
+
+def test_async_collection_matches_sync_bookkeeping(building):
+    """The async tick reads every active sensor through the batched path."""
+    monitoring = MonitoringSystem(building, MonitoringConfig(auto_start=False, use_asyncio=True))
+    active = building.get_active_sensor_count()
+    asyncio.run(monitoring._collect_sensor_readings_async())
+    # A simulated sensor failure may drop a reading, but never adds one
+    assert 0 < monitoring.total_readings <= active
+    assert len(monitoring.reading_history) == 1
+
+
+def summary(total_sensors=1):
+    """Building summary row for ReadingHistory.append."""
+    return {"total_occupancy": 0, "total_energy_consumption": 0.0,
+            "active_sensors": total_sensors, "total_sensors": total_sensors}
+
+
+def test_reading_history_wraps_and_grows_columns():
+    """The history keeps the latest `capacity` ticks and adds sensor columns on demand."""
+    history = ReadingHistory(capacity=3, sensor_capacity=1)
+    sensors = [HVACSensor(hvac_type="temperature", sensor_id=f"hvac_{k}", zone_id="z") for k in range(3)]
+    columns = [history.column(sensor.id, sensor) for sensor in sensors]
+    assert columns == [0, 1, 2]
+    assert history._values.shape[1] >= 3
+
+    for tick in range(5):
+        # Sensor 2 reports only on odd ticks; sensor 1 fails on tick 4
+        cols, values = [0], [float(tick)]
+        if tick % 2:
+            cols.append(2)
+            values.append(10.0 + tick)
+        errors = {1: "failed"} if tick == 4 else {}
+        history.append(1_000_000 * tick, cols, values, [0.9] * len(cols), errors, summary(3))
+
+    assert len(history) == 3
+    snapshots = list(history.snapshots(history.slots_since(0)))
+    assert [s["ts_us"] for s in snapshots] == [2_000_000, 3_000_000, 4_000_000]
+    assert [s["readings"]["hvac_0"]["value"] for s in snapshots] == [2.0, 3.0, 4.0]
+    assert "hvac_2" not in snapshots[0]["readings"]
+    assert snapshots[1]["readings"]["hvac_2"] == {
+        "value": 13.0, "unit": sensors[2].unit, "quality": 0.9,
+        "sensor_type": "hvac_temperature", "zone_id": "z",
+    }
+    assert snapshots[2]["readings"]["hvac_1"] == {"error": "failed"}
+    assert snapshots[2]["building_summary"]["total_sensors"] == 3
+
+    stamps, values, sensor_ids = history.arrays(history.slots_since(3_000_000))
+    assert stamps.tolist() == [3_000_000, 4_000_000]
+    assert values.shape == (2, 3) and sensor_ids == ["hvac_0", "hvac_1", "hvac_2"]
+
+    history.clear()
+    assert len(history) == 0 and list(history.snapshots(history.slots_since(0))) == []
+
+
+def test_entries_since_bisect_boundaries():
+    """_entries_since keeps entries stamped at or after the cutoff."""
+    start = datetime(2024, 1, 1, 12, 0, 0, 500)
+    entries = [{"ts_us": _epoch_us(start + timedelta(seconds=k)), "k": k} for k in range(5)]
+
+    assert _entries_since([], start) == []
+    assert [e["k"] for e in _entries_since(entries, start + timedelta(seconds=2))] == [2, 3, 4]
+    assert [e["k"] for e in _entries_since(entries, start + timedelta(seconds=2, microseconds=1))] == [3, 4]
+    assert _entries_since(entries, start - timedelta(days=1)) == entries
+    assert _entries_since(entries, start + timedelta(seconds=5)) == []
+
+
+def test_epoch_us_round_trips_through_iso():
+    """Epoch microseconds and local ISO timestamps convert back and forth losslessly."""
+    for moment in (datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 7, 15, 13, 45, 30, 123456)):
+        ts_us = _epoch_us(moment)
+        iso = epoch_us_to_iso(ts_us)
+        assert datetime.fromisoformat(iso) == moment
+        assert _epoch_us(datetime.fromisoformat(iso)) == ts_us
+
+
+def test_no_history_still_feeds_anomaly_detector(building):
+    """With save_history off, ticks feed the anomaly detector but store no snapshots."""
+    monitoring = MonitoringSystem(building, MonitoringConfig(auto_start=False, save_history=False))
+    monitoring.simulate_step()
+    assert len(monitoring.reading_history) == 0
+    assert monitoring.total_readings > 0
+    assert set(monitoring.anomaly_detector.count) <= set(building.sensors)
+    assert sum(monitoring.anomaly_detector.count.values()) == monitoring.total_readings
@@ -0,0 +1,201 @@
+"""
+Unit tests for the sensor base class and sensor simulators.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from sbems.sensors._jit_kernels import temp_kernel, temp_kernel_batch
+from sbems.sensors.base_sensor import SensorReading, SensorStatus, take_readings
+from sbems.sensors.energy_meter import EnergyMeter, EnergyMeterFleet, _WEEKDAY_LOAD, _WEEKEND_LOAD
+from sbems.sensors.hvac_sensor import HVACSensor
+from sbems.sensors.lighting_sensor import LightingSensor
+from sbems.sensors.occupancy_sensor import OccupancySensor
+
+# Off-peak hours, where clipping at circuit capacity does not bias the mean
+MONDAY = datetime(2024, 1, 1, 3)
+SATURDAY = datetime(2024, 1, 6, 3)
+
+
+
+def test_sensor_info_follows_reconfiguration():
+    """get_sensor_info reports the current sub-type, unit and normal range."""
+    meter = EnergyMeter(meter_type="power", circuit_capacity=1000.0, sensor_id="energy_info")
+    info = meter.get_sensor_info()
+    assert (info["type"], info["unit"], info["normal_range"]) == ("energy_power", "W", (100.0, 800.0))
+
+    meter.circuit_capacity = 5000.0
+    assert meter.get_sensor_info()["normal_range"] == (100.0, 4000.0)
+
+    meter.meter_type = "voltage"
+    info = meter.get_sensor_info()
+    assert (info["type"], info["unit"], info["normal_range"]) == ("energy_voltage", "V", (220.0, 240.0))
+    assert info["id"] == "energy_info"
+
+    occupancy = OccupancySensor(occupancy_type="people_count", max_occupancy=50)
+    assert occupancy.get_sensor_info()["normal_range"] == (0.0, 50.0)
+    occupancy.max_occupancy = 3
+    assert occupancy.get_sensor_info()["normal_range"] == (0.0, 3.0)
+
+
+def test_take_readings_skips_simulation_of_failing_sensors():
+    """A sensor failing its check is not read, matching take_reading."""
+    failing = EnergyMeter(meter_type="energy_total", sensor_id="energy_fail")
+    failing.failure_probability = 1.0
+    healthy = EnergyMeter(meter_type="energy_total", sensor_id="energy_ok")
+
+    failed, reading = take_readings([failing, healthy], [0.5, 0.5], [0.0, 0.0])
+
+    assert isinstance(failed, RuntimeError)
+    assert failing.status == SensorStatus.ERROR
+    assert failing._last_energy_mono is None
+    assert not failing.readings_history
+    assert isinstance(reading, SensorReading)
+    assert healthy._last_energy_mono is not None
+
+
+def seeded_meter(circuit_capacity=1000.0, seed=0):
+    """Power meter whose simulation draws come from a fixed seed."""
+    meter = EnergyMeter(meter_type="power", circuit_capacity=circuit_capacity)
+    meter._rng = np.random.default_rng(seed)
+    return meter
+
+
+def test_power_batch_shape_dtype_and_clipping():
+    """Batch power samples are float32 and stay within [0, circuit capacity]."""
+    meter = seeded_meter()
+    # Peak hour: the noise often pushes the expected 955 W past the 1000 W capacity
+    power = meter.simulate_power_batch(5000, hours=np.full(5000, 15), weekdays=np.zeros(5000, dtype=int))
+    assert power.shape == (5000,)
+    assert power.dtype == np.float32
+    assert power.min() >= 0.0
+    assert power.max() <= meter.circuit_capacity
+    assert (power == meter.circuit_capacity).any()
+
+
+def test_power_batch_uses_weekday_and_weekend_tables():
+    """Each sample follows its own weekday's load table, centred on _expected_power."""
+    meter = seeded_meter()
+    n = 20000
+    weekdays = np.tile([0, 6], n // 2)
+    power = meter.simulate_power_batch(n, hours=np.full(n, 9), weekdays=weekdays)
+    for day, table in ((0, _WEEKDAY_LOAD), (6, _WEEKEND_LOAD)):
+        samples = power[weekdays == day]
+        np.testing.assert_allclose(samples.mean(), meter._expected_power(table[9]), rtol=1e-2)
+
+
+def test_fleet_tick_matches_meter_model():
+    """Fleet ticks are per-meter float32 samples within capacity, centred on each meter's model."""
+    meters = [EnergyMeter(meter_type="power", circuit_capacity=capacity) for capacity in (1000.0, 5000.0)]
+    fleet = EnergyMeterFleet(meters)
+    fleet._rng = np.random.default_rng(0)
+    assert len(fleet) == 2
+
+    for now, table in ((MONDAY, _WEEKDAY_LOAD), (SATURDAY, _WEEKEND_LOAD)):
+        ticks = np.stack([fleet.tick(now) for _ in range(5000)])
+        assert ticks.shape == (5000, 2)
+        assert ticks.dtype == np.float32
+        assert (ticks >= 0.0).all() and (ticks <= fleet.capacities).all()
+        expected = [meter._expected_power(table[now.hour]) for meter in meters]
+        np.testing.assert_allclose(ticks.mean(axis=0), expected, rtol=1e-2)
+
+
+def test_occupancy_batch_counts_and_motion():
+    """Batch counts are non-negative integers; empty rooms rarely report motion."""
+    sensor = OccupancySensor(max_occupancy=20)
+    sensor._rng = np.random.default_rng(0)
+    n = 20000
+    hours = np.tile([3, 10], n // 2)  # overnight (almost always empty) and mid-morning
+    counts, motion = sensor.simulate_batch(n, hours=hours, weekdays=np.zeros(n, dtype=int))
+
+    assert counts.shape == motion.shape == (n,)
+    assert np.issubdtype(counts.dtype, np.integer)
+    assert motion.dtype == np.bool_
+    assert counts.min() >= 0
+    # 1% false-positive detection, then the 0.8 sensitivity
+    assert motion[counts == 0].mean() < 0.02
+    assert motion[counts > 2].mean() > 0.5
+    assert sensor.last_motion_time is None
+
+
+def test_illuminance_batch_range_and_daylight():
+    """Batch illuminance stays within the clip range and is brighter at midday."""
+    sensor = LightingSensor(lighting_type="illuminance")
+    sensor._rng = np.random.default_rng(0)
+    midday = sensor.simulate_illuminance_batch(5000, hours=np.full(5000, 12))
+    night = sensor.simulate_illuminance_batch(5000, hours=np.full(5000, 2))
+
+    assert midday.shape == night.shape == (5000,)
+    for samples in (midday, night):
+        assert samples.min() >= 0.0 and samples.max() <= 2000.0
+    assert midday.mean() > night.mean()
+
+
+def test_calibration_runs_without_blocking_then_reactivates():
+    """calibrate returns at once; the sensor is CALIBRATING until the window ends, then ACTIVE."""
+    sensor = HVACSensor(hvac_type="temperature")
+    changes = []
+    sensor._status_listener = lambda s, is_active: changes.append(is_active)
+
+    sensor.calibrate(21.5, duration_s=0.05)
+    assert sensor.status == SensorStatus.CALIBRATING
+    assert not sensor.is_active()
+    with pytest.raises(RuntimeError, match="not active"):
+        sensor.take_reading()
+    assert sensor.get_current_reading() == pytest.approx(21.5)
+
+    time.sleep(0.06)
+    assert sensor.status == SensorStatus.ACTIVE
+    assert changes == [False, True]
+    sensor.take_reading(fail_u=1.0, noise_z=0.0)
+
+
+def test_history_size_changes_keep_range_lookup_consistent():
+    """Resizing the history keeps the newest readings and range lookups aligned with them."""
+    sensor = HVACSensor(hvac_type="temperature")
+    sensor.drift_rate = 0.0
+    start = datetime.now() - timedelta(hours=1)
+
+    def read(k):
+        sensor.take_reading(fail_u=1.0, noise_z=0.0, now=start + timedelta(seconds=k))
+
+    def stamps_in_range(first, last):
+        readings = sensor.get_readings_in_range(start + timedelta(seconds=first), start + timedelta(seconds=last))
+        return [(r.timestamp - start).seconds for r in readings]
+
+    sensor.max_history_size = 8
+    for k in range(13):  # wraps the 8-slot ring
+        read(k)
+    sensor.max_history_size = 5
+    assert len(sensor.readings_history) == 5
+    assert sensor.get_statistics()["count"] == 5
+    assert stamps_in_range(0, 100) == [8, 9, 10, 11, 12]
+    assert stamps_in_range(10, 11) == [10, 11]
+
+    sensor.max_history_size = 5000
+    for k in range(13, 40):
+        read(k)
+    assert len(sensor.readings_history) == 32
+    assert sensor.get_statistics()["count"] == 32
+    assert stamps_in_range(0, 9) == [8, 9]
+    assert stamps_in_range(38, 100) == [38, 39]
+    assert sensor.get_recent_readings(1)[0].value == sensor.get_statistics()["current"]
+
+
+def test_temp_kernel_batch_matches_scalar_kernel():
+    """The parallel batch kernel pairs each hour, day, occupancy and noise sample like temp_kernel."""
+    hours = np.array([0, 6, 14, 20, 23], dtype=np.int64)
+    doys = np.array([1, 80, 172, 266, 366], dtype=np.int64)
+    occ = np.array([0.0, 0.5, 1.5, 0.2, 0.0])
+    noise = np.array([0.3, -0.2, 20.0, -30.0, 0.1])  # the last two push past the 10-35 °C clip
+
+    batch = temp_kernel_batch(hours, doys, 22.0, 3.0, 2.0, occ, noise)
+    expected = [
+        temp_kernel(h, d, 22.0, 3.0, 2.0, o, z)
+        for h, d, o, z in zip(hours.tolist(), doys.tolist(), occ.tolist(), noise.tolist())
+    ]
+    np.testing.assert_allclose(batch, expected)
+    assert batch[2] == 35.0 and batch[3] == 10.0